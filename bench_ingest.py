@@ -0,0 +1,230 @@
+"""
+bench_ingest.py
+Ingestion throughput benchmark for seed_data.py that needs no Opik backend.
+Starts a local HTTP stand-in for the REST endpoints the seeder calls (bulk
+traces and spans, feedback scores, thread close, trace search), optionally
+delaying every response, and runs the seeder against it as a subprocess in
+each mode:
+
+    sequential   one worker, one record per request (the unbatched baseline)
+    batched      one worker, bulk requests
+    parallel     --workers workers, bulk requests
+
+Each run records traces/sec, spans/sec, requests and bytes the stand-in
+received, and the seeder's peak RSS. The rates are taken over the stand-in's
+ingest window (first request in to last response out), so interpreter start-up
+and the opik import don't dilute them; the subprocess wall time is reported
+alongside. Results go to a JSON file so ingestion
+can be tracked across changes.
+
+    python bench_ingest.py --modes sequential,batched,parallel --traces 5000 --latency-ms 0,20 --output bench_ingest.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import collections
+from datetime import datetime, timezone
+from importlib import metadata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CONFIG
+# Environment per mode, on top of the shared settings in run_seeder()
+# ──────────────────────────────────────────────────────────────────────────────
+SEED_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_data.py")
+MODES = {
+    "sequential": {"SEED_WORKERS": "1", "SEED_BATCH_ITEMS": "1"},
+    "batched":    {"SEED_WORKERS": "1"},
+    "parallel":   {},   # SEED_WORKERS from --workers
+}
+SEED = 42
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MOCK BACKEND
+# Accepts any request, counts it per endpoint, sleeps `latency` seconds and
+# answers 204. That suits every call the seeder makes: the bulk writes return
+# nothing, and an empty trace search means "no data yet, go ahead and seed".
+# ──────────────────────────────────────────────────────────────────────────────
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real backend
+
+    def _handle(self):
+        size = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(size)
+        # ".../v1/private/traces/batch" -> "POST traces/batch"
+        path = self.path.split("?")[0]
+        endpoint = f"{self.command} {path.split('/v1/private/', 1)[-1].strip('/')}"
+        self.server.record(endpoint, size)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.server.answered()
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+class MockOpik(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.0):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.latency = latency
+        self._lock   = threading.Lock()
+        self.reset()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = collections.defaultdict(lambda: {"requests": 0, "bytes": 0})
+            self.first = self.last = None
+
+    def record(self, endpoint, size):
+        now = time.perf_counter()
+        with self._lock:
+            stats = self.endpoints[endpoint]
+            stats["requests"] += 1
+            stats["bytes"]    += size
+            self.first = self.first or now
+
+    def answered(self):
+        now = time.perf_counter()
+        with self._lock:
+            self.last = max(self.last or now, now)
+
+    def stats(self):
+        with self._lock:
+            endpoints = {k: dict(v) for k, v in sorted(self.endpoints.items())}
+            return {
+                "requests":    sum(v["requests"] for v in endpoints.values()),
+                "bytes":       sum(v["bytes"] for v in endpoints.values()),
+                "ingest_secs": (self.last - self.first) if self.first and self.last else 0.0,
+                "endpoints":   endpoints,
+            }
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MEASUREMENT
+# ──────────────────────────────────────────────────────────────────────────────
+def run_seeder(server, mode, traces, workers, workdir):
+    # Runs seed_data.py once in a fresh checkpoint/config so it neither skips
+    # nor resumes; returns the run's measurements
+    checkpoint = os.path.join(workdir, f"checkpoint_{mode}.json")
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    config_path = os.path.join(workdir, "opik.config")
+    with open(config_path, "w") as f:
+        f.write("[opik]\n")
+    env = dict(
+        os.environ,
+        OPIK_URL_OVERRIDE   = server.url,
+        OPIK_API_KEY        = "bench",
+        OPIK_WORKSPACE      = "bench",
+        OPIK_PROJECT_NAME   = "bench-ingest",
+        OPIK_CONFIG_PATH    = config_path,
+        SEED_SINK           = "opik",
+        SEED_TARGET_TRACES  = str(traces),
+        SEED_MASTER_SEED    = str(SEED),
+        SEED_CHECKPOINT     = checkpoint,
+        SEED_WORKERS        = str(workers),
+    )
+    env.update(MODES[mode])
+
+    server.reset()
+    with tempfile.TemporaryFile() as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, SEED_SCRIPT], env=env, stdin=subprocess.DEVNULL,
+                                stdout=log, stderr=subprocess.STDOUT)
+        # wait4 rather than wait(): it returns this child's own resource usage
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode != 0:
+            log.seek(0)
+            tail = log.read().decode(errors="replace")[-2000:]
+            raise RuntimeError(f"seed_data.py failed in mode '{mode}' (exit {proc.returncode}):\n{tail}")
+
+    with open(checkpoint) as f:
+        done = json.load(f)["done"]
+    stats = server.stats()
+    window = stats["ingest_secs"] or wall   # a run that made a single request has no window
+    return {
+        "traces":          done["traces"],
+        "spans":           done["spans"],
+        "threads":         done["threads"],
+        "wall_secs":       wall,
+        "traces_per_sec":  done["traces"] / window,
+        "spans_per_sec":   done["spans"] / window,
+        "peak_rss_mb":     usage.ru_maxrss / 1024,   # ru_maxrss is in KiB on Linux
+        **stats,
+    }
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────────────────────
+def print_row(mode, latency_ms, r):
+    print(f"   {mode:<11} {latency_ms:>5g}ms  {r['traces_per_sec']:>9,.0f} traces/s  {r['spans_per_sec']:>9,.0f} spans/s  "
+          f"{r['requests']:>7,} req  {r['bytes'] / 1e6:>8,.1f} MB  {r['peak_rss_mb']:>6,.0f} MB RSS  "
+          f"{r['ingest_secs']:>6.2f}s ingest / {r['wall_secs']:.2f}s wall")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark seed_data.py ingestion against a local mock Opik backend.")
+    parser.add_argument("--modes", default="sequential,batched,parallel", help=f"comma-separated subset of {','.join(MODES)}")
+    parser.add_argument("--traces", type=int, default=5000, help="traces generated per run")
+    parser.add_argument("--workers", type=int, default=8, help="seeder workers in parallel mode")
+    parser.add_argument("--latency-ms", default="0", help="comma-separated per-request latencies injected by the mock")
+    parser.add_argument("--output", default="bench_ingest.json", help="where to write machine-readable results")
+    args = parser.parse_args(argv)
+
+    modes = args.modes.split(",")
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode '{mode}'")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python":    platform.python_version(),
+            "opik":      metadata.version("opik"),
+            "platform":  platform.platform(),
+            "cpus":      os.cpu_count(),
+            "traces":    args.traces,
+            "workers":   args.workers,
+            "seed":      SEED,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_ingest.") as workdir:
+        for latency_ms in (float(l) for l in args.latency_ms.split(",")):
+            server = MockOpik(latency=latency_ms / 1000)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            print(f"\n⏱️  Mock backend at {server.url} with {latency_ms:g}ms latency, {args.traces:,} traces per run")
+            try:
+                for mode in modes:
+                    r = run_seeder(server, mode, args.traces, args.workers, workdir)
+                    report["results"].append(dict(mode=mode, latency_ms=latency_ms, **r))
+                    print_row(mode, latency_ms, r)
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+bench_queries.py
+Latency and throughput benchmark for the chatbot's canonical SQL workload
+(lab_setup.CANONICAL_QUERIES, built from the `sql` strings in
+seed_data.DATABASE_TURNS) against ohm_sweet_ohm.db at several generated sizes.
+
+Each size is built once with lab_setup's synthetic catalog generator and cached
+under data/bench/. Every query is timed single-threaded, and then the whole
+workload runs mixed across several concurrent read-only connections. Results
+go to a JSON file so runs can be diffed between schema changes.
+
+    python bench_queries.py --sizes fixture,small,medium --threads 1,4,8 --output bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import platform
+import statistics
+import threading
+from datetime import datetime, timezone
+
+import lab_setup
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CONFIG
+# (products, orders, stores) per named size. store_inventory is products × stores.
+# ──────────────────────────────────────────────────────────────────────────────
+SIZES = {
+    "fixture": (0, 0, 0),
+    "small":   (10_000, 20_000, 10),
+    "medium":  (100_000, 200_000, 20),
+    "large":   (1_000_000, 1_000_000, 10),
+}
+BENCH_DIR = os.path.join(lab_setup.DATA_DIR, "bench")
+SEED      = 42
+
+# ──────────────────────────────────────────────────────────────────────────────
+# DATABASES
+# ──────────────────────────────────────────────────────────────────────────────
+def bench_db_path(size):
+    # The key covers the schema and DDL too, so a schema change builds a fresh database
+    n_products, n_orders, n_stores = SIZES[size]
+    key = lab_setup.artifact_key(synthetic=[n_products, n_orders, n_stores, SEED])[:12]
+    return os.path.join(BENCH_DIR, f"ohm_{size}_p{n_products}_o{n_orders}_s{n_stores}_seed{SEED}_{key}.db")
+
+def ensure_bench_db(size, rebuild=False):
+    path = bench_db_path(size)
+    if rebuild or not os.path.exists(path):
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        print(f"🏗️  Building '{size}' benchmark database...")
+        lab_setup.create_database(streams=lab_setup.synthetic_table_streams(*SIZES[size], seed=SEED), db_path=path)
+    return path
+
+def open_readonly(path):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def table_rows(path):
+    conn = open_readonly(path)
+    try:
+        return {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in lab_setup.TABLE_INSERTS}
+    finally:
+        conn.close()
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MEASUREMENT
+# ──────────────────────────────────────────────────────────────────────────────
+def summarize(latencies, wall_secs):
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "count":   len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms":  cuts[49] * 1000,
+        "p95_ms":  cuts[94] * 1000,
+        "p99_ms":  cuts[98] * 1000,
+        "max_ms":  max(latencies) * 1000,
+        "qps":     len(latencies) / wall_secs if wall_secs > 0 else float("inf"),
+    }
+
+def time_query(conn, sql):
+    start = time.perf_counter()
+    conn.execute(sql).fetchall()
+    return time.perf_counter() - start
+
+def run_single(path, queries, iterations, warmup):
+    conn = open_readonly(path)
+    results = []
+    try:
+        for sql in queries:
+            for _ in range(warmup):
+                time_query(conn, sql)
+            start = time.perf_counter()
+            latencies = [time_query(conn, sql) for _ in range(iterations)]
+            results.append(dict(query=sql, **summarize(latencies, time.perf_counter() - start)))
+    finally:
+        conn.close()
+    return results
+
+def run_concurrent(path, queries, threads, iterations):
+    # Every worker runs the mixed workload in its own shuffled order on its own
+    # connection. sqlite3 releases the GIL while a statement runs, so this
+    # measures real read concurrency on the file.
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(idx):
+        conn = open_readonly(path)
+        rng = random.Random(idx)
+        workload = list(queries) * max(1, iterations // len(queries))
+        rng.shuffle(workload)
+        try:
+            barrier.wait()
+            for sql in workload:
+                latencies[idx].append(time_query(conn, sql))
+        finally:
+            conn.close()
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    wall = time.perf_counter() - start
+    return dict(query="ALL", **summarize([l for per_thread in latencies for l in per_thread], wall))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────────────────────
+def print_row(label, r):
+    print(f"   {label:<52} p50 {r['p50_ms']:>8.3f}ms  p95 {r['p95_ms']:>8.3f}ms  "
+          f"p99 {r['p99_ms']:>8.3f}ms  {r['qps']:>10,.0f} q/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the canonical chatbot SQL workload.")
+    parser.add_argument("--sizes", default="fixture,small", help=f"comma-separated subset of {','.join(SIZES)}")
+    parser.add_argument("--threads", default="1,4,8", help="comma-separated concurrent connection counts")
+    parser.add_argument("--iterations", type=int, default=200, help="timed runs per query (per thread when concurrent)")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed runs per query before measuring")
+    parser.add_argument("--rebuild", action="store_true", help="regenerate cached benchmark databases")
+    parser.add_argument("--output", default="bench_queries.json", help="where to write machine-readable results")
+    args = parser.parse_args(argv)
+
+    queries = lab_setup.CANONICAL_QUERIES
+    report = {
+        "meta": {
+            "timestamp":      datetime.now(timezone.utc).isoformat(),
+            "python":         platform.python_version(),
+            "sqlite":         sqlite3.sqlite_version,
+            "platform":       platform.platform(),
+            "iterations":     args.iterations,
+            "seed":           SEED,
+        },
+        "results": [],
+    }
+
+    for size in args.sizes.split(","):
+        path = ensure_bench_db(size, args.rebuild)
+        rows = table_rows(path)
+        print(f"\n📏 {size}: {sum(rows.values()):,} rows  ({path})")
+
+        for r in run_single(path, queries, args.iterations, args.warmup):
+            report["results"].append(dict(size=size, rows=rows, mode="single", threads=1, **r))
+            print_row(r["query"][:52], r)
+
+        for threads in (int(t) for t in args.threads.split(",")):
+            r = run_concurrent(path, queries, threads, args.iterations)
+            report["results"].append(dict(size=size, rows=rows, mode="concurrent", threads=threads, **r))
+            print_row(f"mixed workload × {threads} connection(s)", r)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
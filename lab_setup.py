@@ -1,12 +1,46 @@
 import os
+import sys
 import sqlite3
 import json
+import hashlib
+import tempfile
+import random
+import time
+import argparse
+import itertools
+import re
+import gzip
+import zlib
+import shutil
+
+import seed_data
+
+# numpy is only needed for the vector index; everything else works without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # --- CONFIGURATION ---
 BASE_DIR = os.getcwd()
 DATA_DIR = os.path.join(BASE_DIR, "data")
 DB_PATH = os.path.join(DATA_DIR, "ohm_sweet_ohm.db")
 FAQ_PATH = os.path.join(DATA_DIR, "faq.txt")
+FAQ_INDEX_PATH = os.path.join(DATA_DIR, "faq_index.db")
+VECTOR_INDEX_PATH = os.path.join(DATA_DIR, "vectors.npy")
+VECTOR_IDF_PATH = os.path.join(DATA_DIR, "vector_idf.npy")
+VECTOR_DOCS_PATH = os.path.join(DATA_DIR, "vector_docs.jsonl")
+
+# Hashed TF-IDF embedding: output dimensions and hash seed
+EMBED_DIM = 2048
+EMBED_SEED = 1234
+
+# Prebuilt artifacts are cached here, keyed by a hash of everything they are built from
+CACHE_DIR = os.environ.get("OHM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ohm_sweet_ohm"))
+CACHE_KEEP = 4  # most recently used cache entries kept; older ones are pruned
+# Bump whenever the build itself changes (row streams, FAQ chunking, embeddings...),
+# so caches built by older code are never reused. The DDL is hashed automatically.
+SCHEMA_VERSION = 2
 
 # --- 1. RAW DATA (Your JSON Data) ---
 # I have pasted your data into these lists directly.
@@ -114,71 +148,561 @@ def setup_directories():
         os.makedirs(DATA_DIR)
         print(f"✅ Created directory: {DATA_DIR}")
 
-def create_database():
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH) # Clean slate every time
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # --- TABLE DEFINITIONS ---
-    cursor.execute('''CREATE TABLE IF NOT EXISTS products (product_id TEXT PRIMARY KEY, name TEXT, description TEXT, price REAL, category TEXT, in_stock INTEGER)''')
-    cursor.execute('''CREATE TABLE IF NOT EXISTS orders (order_id TEXT PRIMARY KEY, customer_name TEXT, customer_email TEXT, status TEXT, days_since_order INTEGER, current_location TEXT)''')
-    cursor.execute('''CREATE TABLE IF NOT EXISTS order_items (order_id TEXT, product_id TEXT, quantity INTEGER, unit_price REAL)''')
-    cursor.execute('''CREATE TABLE IF NOT EXISTS stores (store_id TEXT PRIMARY KEY, name TEXT, address TEXT, phone TEXT)''')
-    cursor.execute('''CREATE TABLE IF NOT EXISTS store_inventory (store_id TEXT, product_id TEXT, stock_level INTEGER)''')
-    cursor.execute('''CREATE TABLE IF NOT EXISTS promotions (promotion_id TEXT PRIMARY KEY, description TEXT, discount_percent REAL, discount_amount REAL, category TEXT, product_ids TEXT)''')
-
-    # --- DATA INSERTION ---
-
-    # 1. PRODUCTS
-    for p in RAW_PRODUCTS:
+# --- 2. SCHEMA ---
+TABLE_DEFINITIONS = [
+    '''CREATE TABLE IF NOT EXISTS products (product_id TEXT PRIMARY KEY, name TEXT, description TEXT, price REAL, category TEXT, in_stock INTEGER)''',
+    '''CREATE TABLE IF NOT EXISTS orders (order_id TEXT PRIMARY KEY, customer_name TEXT, customer_email TEXT, status TEXT, days_since_order INTEGER, current_location TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS order_items (order_id TEXT, product_id TEXT, quantity INTEGER, unit_price REAL)''',
+    '''CREATE TABLE IF NOT EXISTS stores (store_id TEXT PRIMARY KEY, name TEXT, address TEXT, phone TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS store_inventory (store_id TEXT, product_id TEXT, stock_level INTEGER)''',
+    '''CREATE TABLE IF NOT EXISTS promotions (promotion_id TEXT PRIMARY KEY, type TEXT, store_id TEXT, description TEXT, discount_percent REAL, discount_amount REAL, category TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS promotion_products (promotion_id TEXT, product_id TEXT, PRIMARY KEY (promotion_id, product_id)) WITHOUT ROWID''',
+    # Bumped for every table a load or sync writes to; sql_tool's result cache keys off it
+    '''CREATE TABLE IF NOT EXISTS table_versions (table_name TEXT PRIMARY KEY, version INTEGER NOT NULL) WITHOUT ROWID''',
+]
+
+TABLE_INSERTS = {
+    "products":        "INSERT INTO products VALUES (?,?,?,?,?,?)",
+    "orders":          "INSERT INTO orders VALUES (?,?,?,?,?,?)",
+    "order_items":     "INSERT INTO order_items VALUES (?,?,?,?)",
+    "stores":          "INSERT INTO stores VALUES (?,?,?,?)",
+    "store_inventory": "INSERT INTO store_inventory VALUES (?,?,?)",
+    "promotions":      "INSERT INTO promotions VALUES (?,?,?,?,?,?,?)",
+    "promotion_products": "INSERT INTO promotion_products VALUES (?,?)",
+}
+
+# Secondary indexes for the chatbot's access patterns. Created after the load,
+# which is much cheaper than maintaining them row by row during the inserts.
+INDEX_DEFINITIONS = [
+    '''CREATE INDEX IF NOT EXISTS idx_products_category ON products (category)''',
+    # (name, product_id) covers name lookups that join on to other tables
+    '''CREATE INDEX IF NOT EXISTS idx_products_name ON products (name, product_id)''',
+    '''CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items (order_id, product_id, quantity, unit_price)''',
+    '''CREATE UNIQUE INDEX IF NOT EXISTS idx_store_inventory_store_product ON store_inventory (store_id, product_id)''',
+    '''CREATE INDEX IF NOT EXISTS idx_store_inventory_product ON store_inventory (product_id, store_id, stock_level)''',
+    '''CREATE INDEX IF NOT EXISTS idx_promotions_store ON promotions (store_id)''',
+    # The primary key covers promotion -> products; this covers product -> promotions
+    '''CREATE INDEX IF NOT EXISTS idx_promotion_products_product ON promotion_products (product_id, promotion_id)''',
+]
+
+# Canonical queries the chatbot runs against the DB: the `sql` of every
+# seed_data.DATABASE_TURNS turn, then the follow-up lookups below.
+# check_query_plans() fails if any of these scans, bar the KNOWN_SCANS below.
+CANONICAL_QUERIES = [turn["sql"] for turn in seed_data.DATABASE_TURNS if turn.get("sql")] + [
+    # Follow-up lookups: order contents and per-store stock
+    "SELECT p.name, oi.quantity FROM order_items oi JOIN products p ON p.product_id = oi.product_id WHERE oi.order_id = 'TECH-001'",
+    "SELECT s.name, si.stock_level FROM store_inventory si JOIN stores s ON s.store_id = si.store_id WHERE si.product_id = 'AUDIO-101'",
+    "SELECT stock_level FROM store_inventory WHERE store_id = 'SF-DOWNTOWN' AND product_id = 'AUDIO-101'",
+    "SELECT pr.description, pr.discount_percent, pr.discount_amount FROM promotions pr JOIN promotion_products pp ON pp.promotion_id = pr.promotion_id WHERE pp.product_id = 'GAME-1102' AND pr.store_id = 'SF-UNION'",
+]
+
+# Canonical queries check_query_plans() lets scan, each with the reason. The
+# AirStream lookup is the chatbot's own recorded SQL (seed_data.DATABASE_TURNS):
+# its leading-wildcard LIKE can't seek any B-tree index, so it reads all of
+# idx_products_name. That is O(products), about 3.5 ms at 10k products in
+# bench_queries against ~0.01 ms for the others. Any other scan, covering index
+# or not, fails the check.
+KNOWN_SCANS = {
+    "SELECT stock_level FROM store_inventory si JOIN products p ON si.product_id = p.product_id WHERE p.name LIKE '%AirStream Wireless Earbuds%'",
+}
+
+# Rows per executemany() call during a bulk load
+BATCH_SIZE = 10000
+
+# Pragmas used while bulk-loading a fresh file. The build starts from an empty
+# database, so there is nothing to recover if it dies half way through and we
+# can skip the rollback journal and fsyncs entirely.
+BULK_LOAD_PRAGMAS = [
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA cache_size=-262144",  # negative = KiB, i.e. 256 MB of page cache
+]
+
+# --- 3. ROW STREAMS ---
+# One generator per table, each yielding ready-to-insert tuples. Both load paths
+# consume these, so the row-by-row and bulk databases are identical.
+
+def product_rows(products):
+    for p in products:
         in_stock_val = 1 if p.get('in_stock', True) else 0
-        cursor.execute("INSERT INTO products VALUES (?,?,?,?,?,?)", 
-                       (p['product_id'], p['name'], p['description'], p['price'], p['category'], in_stock_val))
-
-    # 2. ORDERS & ORDER ITEMS
-    for o in RAW_ORDERS:
-        cursor.execute("INSERT INTO orders VALUES (?,?,?,?,?,?)", 
-                       (o['order_id'], o['customer_name'], o['customer_email'], o['status'], o['days_since_order'], o['current_location']))
-        
-        # Populate order_items table for better SQL queries later
-        if 'items' in o:
-            for item in o['items']:
-                cursor.execute("INSERT INTO order_items VALUES (?,?,?,?)",
-                               (o['order_id'], item['product_id'], item['quantity'], item['price']))
-
-    # 3. STORES & INVENTORY
-    for s in RAW_STORES:
-        cursor.execute("INSERT INTO stores VALUES (?,?,?,?)", 
-                       (s['store_id'], s['name'], s['address'], s['phone']))
-        
-        # Flatten the inventory dict into rows
-        if 'inventory' in s:
-            for pid, qty in s['inventory'].items():
-                cursor.execute("INSERT INTO store_inventory VALUES (?,?,?)",
-                               (s['store_id'], pid, qty))
-
-    # 4. PROMOTIONS
-    for pm in RAW_PROMOTIONS:
+        yield (p['product_id'], p['name'], p['description'], p['price'], p['category'], in_stock_val)
+
+def order_rows(orders):
+    for o in orders:
+        yield (o['order_id'], o['customer_name'], o['customer_email'], o['status'], o['days_since_order'], o['current_location'])
+
+def order_item_rows(orders):
+    # Populate order_items table for better SQL queries later
+    for o in orders:
+        for item in o.get('items', []):
+            yield (o['order_id'], item['product_id'], item['quantity'], item['price'])
+
+def store_rows(stores):
+    for s in stores:
+        yield (s['store_id'], s['name'], s['address'], s['phone'])
+
+def store_inventory_rows(stores):
+    # Flatten the inventory dict into rows
+    for s in stores:
+        for pid, qty in s.get('inventory', {}).items():
+            yield (s['store_id'], pid, qty)
+
+def promotion_rows(promotions):
+    for pm in promotions:
+        yield (pm['promotion_id'], pm.get('type'), pm.get('store_id'), pm['description'], pm.get('discount_percent'), pm.get('discount_amount'), pm.get('category'))
+
+def promotion_product_rows(promotions):
+    # One row per (promotion, product) pair so promotion lookups are indexed
+    # equi-joins instead of substring matches on a comma-joined list.
+    for pm in promotions:
         # Handle product_ids (could be list, string, or None)
         p_ids = pm.get('product_ids')
         if p_ids is None and 'product_id' in pm:
             p_ids = pm['product_id'] # Use the single ID if list missing
-        
-        # If it's a list, join it to string for simple SQLite storage
-        if isinstance(p_ids, list):
-            p_ids = ",".join(p_ids)
-            
-        cursor.execute("INSERT INTO promotions VALUES (?,?,?,?,?,?)", 
-                       (pm['promotion_id'], pm['description'], pm.get('discount_percent'), pm.get('discount_amount'), pm.get('category'), p_ids))
+        if p_ids is None:
+            continue
+        if isinstance(p_ids, str):
+            p_ids = p_ids.split(",")
+
+        for pid in dict.fromkeys(pid.strip() for pid in p_ids):
+            yield (pm['promotion_id'], pid)
+
+def table_streams(products=RAW_PRODUCTS, orders=RAW_ORDERS, stores=RAW_STORES, promotions=RAW_PROMOTIONS):
+    # Insert order matters only for readability of the load report
+    return [
+        ("products",        product_rows(products)),
+        ("orders",          order_rows(orders)),
+        ("order_items",     order_item_rows(orders)),
+        ("stores",          store_rows(stores)),
+        ("store_inventory", store_inventory_rows(stores)),
+        ("promotions",      promotion_rows(promotions)),
+        ("promotion_products", promotion_product_rows(promotions)),
+    ]
+
+# Input files: the same entities as RAW_* (one JSON object per line, same keys),
+# optionally gzip-compressed. Records are parsed one line at a time straight
+# into the row streams, so memory stays flat whatever the file size. An entity
+# without a file falls back to its RAW_* fixture.
+INPUT_FILES = {
+    "products":   RAW_PRODUCTS,
+    "orders":     RAW_ORDERS,
+    "stores":     RAW_STORES,
+    "promotions": RAW_PROMOTIONS,
+}
+
+def read_records(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON record ({e})") from None
 
+def find_input_files(input_dir):
+    # {entity: path} for every <entity>.jsonl or <entity>.jsonl.gz in input_dir
+    found = {}
+    for entity in INPUT_FILES:
+        for name in (f"{entity}.jsonl", f"{entity}.jsonl.gz"):
+            path = os.path.join(input_dir, name)
+            if os.path.exists(path):
+                found[entity] = path
+    return found
+
+def file_table_streams(products=None, orders=None, stores=None, promotions=None):
+    # Like table_streams(), with each entity read from its file if given. Entities
+    # that feed two tables are read twice rather than held in memory.
+    def records(path, fixture):
+        return read_records(path) if path else iter(fixture)
+    return [
+        ("products",        product_rows(records(products, RAW_PRODUCTS))),
+        ("orders",          order_rows(records(orders, RAW_ORDERS))),
+        ("order_items",     order_item_rows(records(orders, RAW_ORDERS))),
+        ("stores",          store_rows(records(stores, RAW_STORES))),
+        ("store_inventory", store_inventory_rows(records(stores, RAW_STORES))),
+        ("promotions",      promotion_rows(records(promotions, RAW_PROMOTIONS))),
+        ("promotion_products", promotion_product_rows(records(promotions, RAW_PROMOTIONS))),
+    ]
+
+def export_fixture(output_dir, compress=True):
+    # Writes the RAW_* fixture as input files, a starting point for custom data
+    os.makedirs(output_dir, exist_ok=True)
+    for entity, records in INPUT_FILES.items():
+        path = os.path.join(output_dir, f"{entity}.jsonl" + (".gz" if compress else ""))
+        opener = gzip.open if compress else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        print(f"✅ Exported {len(records)} {entity} to: {path}")
+
+# Synthetic catalog for benchmarking at production scale. The fixture rows above
+# serve as templates: generated tables always start with the fixture itself, so
+# the canonical queries keep their answers, and extra rows are derived from
+# (seed, index) alone. Everything is streamed, so 10M+ rows never sit in memory.
+
+def _splitmix64(seed, i):
+    # Cheap stateless hash: attributes of row i don't depend on generation order
+    z = (seed * 0x9E3779B97F4A7C15 + (i + 1) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return z ^ (z >> 31)
+
+def synthetic_product_id(i):
+    if i < len(RAW_PRODUCTS):
+        return RAW_PRODUCTS[i]['product_id']
+    return f"{RAW_PRODUCTS[i % len(RAW_PRODUCTS)]['product_id']}-G{i}"
+
+def synthetic_product(i, seed):
+    if i < len(RAW_PRODUCTS):
+        return RAW_PRODUCTS[i]
+    template = RAW_PRODUCTS[i % len(RAW_PRODUCTS)]
+    h = _splitmix64(seed, i)
+    return {
+        "product_id":  synthetic_product_id(i),
+        "name":        f"{template['name']} (G{i})",
+        "description": template['description'],
+        "price":       round(template['price'] * (0.7 + 0.6 * (h & 0xFFFF) / 0xFFFF), 2),
+        "category":    template['category'],
+        "in_stock":    (h >> 16) % 10 != 0,  # ~10% out of stock
+    }
+
+def synthetic_products(n_products, seed):
+    for i in range(n_products):
+        yield synthetic_product(i, seed)
+
+def synthetic_orders(n_orders, n_products, seed):
+    yield from RAW_ORDERS
+    rng = random.Random(f"{seed}:orders")
+    for j in range(len(RAW_ORDERS), n_orders):
+        template = RAW_ORDERS[j % len(RAW_ORDERS)]
+        items = []
+        for idx in rng.sample(range(n_products), rng.choice([1, 1, 2, 2, 3])):
+            items.append({"product_id": synthetic_product_id(idx), "quantity": rng.randint(1, 3),
+                          "price": synthetic_product(idx, seed)['price']})
+        yield {
+            "order_id":         f"GEN-{j:09d}",
+            "customer_name":    template['customer_name'],
+            "customer_email":   f"customer{j}@email.com",
+            "days_since_order": rng.randint(0, 30),
+            "status":           template['status'],
+            "current_location": template['current_location'],
+            "items":            items,
+        }
+
+def synthetic_stores(n_stores):
+    yield from RAW_STORES
+    for k in range(len(RAW_STORES), n_stores):
+        template = RAW_STORES[k % len(RAW_STORES)]
+        yield {"store_id": f"{template['store_id']}-{k}", "name": f"{template['name']} #{k}",
+               "address": template['address'], "phone": template['phone']}
+
+def synthetic_inventory_rows(n_stores, n_products, seed):
+    # Full store x product matrix; fixture stores keep their fixture stock levels
+    for k, store in enumerate(synthetic_stores(n_stores)):
+        fixture = store.get('inventory', {})
+        rng = random.Random(f"{seed}:inventory:{k}")
+        for i in range(n_products):
+            pid = synthetic_product_id(i)
+            qty = fixture[pid] if pid in fixture else rng.randint(0, 40)
+            yield (store['store_id'], pid, qty)
+
+def synthetic_table_streams(n_products, n_orders, n_stores, seed=42):
+    # Never generate fewer rows than the fixture has
+    n_products = max(n_products, len(RAW_PRODUCTS))
+    n_orders = max(n_orders, len(RAW_ORDERS))
+    n_stores = max(n_stores, len(RAW_STORES))
+    return [
+        ("products",        product_rows(synthetic_products(n_products, seed))),
+        ("orders",          order_rows(synthetic_orders(n_orders, n_products, seed))),
+        ("order_items",     order_item_rows(synthetic_orders(n_orders, n_products, seed))),
+        ("stores",          store_rows(synthetic_stores(n_stores))),
+        ("store_inventory", synthetic_inventory_rows(n_stores, n_products, seed)),
+        ("promotions",      promotion_rows(RAW_PROMOTIONS)),
+        ("promotion_products", promotion_product_rows(RAW_PROMOTIONS)),
+    ]
+
+# --- 4. LOADERS ---
+def batched(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def create_schema(conn):
+    for statement in TABLE_DEFINITIONS:
+        conn.execute(statement)
+
+def read_table_versions(db_path):
+    # {table: version} of an existing DB, or {} if there is none (or it predates table_versions)
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return {}
+    try:
+        return dict(conn.execute("SELECT table_name, version FROM table_versions"))
+    except sqlite3.Error:
+        return {}
+    finally:
+        conn.close()
+
+def bump_table_versions(conn, tables, previous=None):
+    # With `previous`, versions continue from the DB being replaced, so they never
+    # go backwards across a rebuild; otherwise they count up from what's stored.
+    if previous is not None:
+        conn.executemany("INSERT OR REPLACE INTO table_versions VALUES (?, ?)",
+                         [(t, previous.get(t, 0) + 1) for t in tables])
+    else:
+        conn.executemany("INSERT INTO table_versions VALUES (?, 1) "
+                         "ON CONFLICT (table_name) DO UPDATE SET version = version + 1",
+                         [(t,) for t in tables])
+
+def create_indexes(conn, analyze=True):
+    for statement in INDEX_DEFINITIONS:
+        conn.execute(statement)
+    # Without statistics the planner drives the name lookup from store_inventory
+    # and scans it, rather than scanning the much narrower products name index.
+    if analyze:
+        conn.execute("ANALYZE")
+
+def load_row_by_row(conn, streams):
+    # Original loader: one execute() per row. Kept for benchmarking against bulk_load().
+    cursor = conn.cursor()
+    stats = []
+    for table, rows in streams:
+        sql = TABLE_INSERTS[table]
+        start = time.perf_counter()
+        count = 0
+        for row in rows:
+            cursor.execute(sql, row)
+            count += 1
+        stats.append((table, count, time.perf_counter() - start))
     conn.commit()
-    conn.close()
-    print(f"✅ Database created at: {DB_PATH}")
+    return stats
 
-def create_faq():
-    faq_content = """
+def bulk_load(conn, streams):
+    # Streams every table through executemany() in BATCH_SIZE chunks inside a
+    # single explicit transaction. Expects an empty database.
+    for pragma in BULK_LOAD_PRAGMAS:
+        conn.execute(pragma)
+
+    stats = []
+    conn.execute("BEGIN")
+    try:
+        for table, rows in streams:
+            sql = TABLE_INSERTS[table]
+            start = time.perf_counter()
+            count = 0
+            for batch in batched(rows):
+                conn.executemany(sql, batch)
+                count += len(batch)
+            stats.append((table, count, time.perf_counter() - start))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return stats
+
+def print_load_report(stats, label):
+    total_rows = sum(count for _, count, _ in stats)
+    total_secs = sum(secs for _, _, secs in stats)
+    print(f"📊 Load report ({label}):")
+    for table, count, secs in stats + [("TOTAL", total_rows, total_secs)]:
+        rate = count / secs if secs > 0 else float("inf")
+        print(f"   {table:<18} {count:>10,} rows  {secs:>8.3f}s  {rate:>12,.0f} rows/sec")
+
+def finalize_database(conn):
+    # Last pass over a freshly built file before it is published
+    result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    if result != "ok":
+        raise RuntimeError(f"Integrity check failed on new database: {result}")
+    conn.execute("ANALYZE")
+    conn.execute("VACUUM")
+
+def create_database(bulk=True, streams=None, db_path=DB_PATH):
+    # Build into a temp file next to DB_PATH and swap it in with os.replace().
+    # The rename is atomic, so the chatbot never sees a missing or half-loaded
+    # database: open connections keep reading the old file, new ones get the new one.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(db_path), prefix=".ohm_sweet_ohm.", suffix=".db.tmp")
+    os.close(fd)
+    previous_versions = read_table_versions(db_path) if os.path.exists(db_path) else {}
+
+    try:
+        # Autocommit mode so bulk_load() controls the transaction boundaries itself
+        conn = sqlite3.connect(tmp_path, isolation_level=None if bulk else "")
+        try:
+            create_schema(conn)
+
+            if bulk:
+                stats = bulk_load(conn, streams or table_streams())
+            else:
+                stats = load_row_by_row(conn, streams or table_streams())
+
+            bump_table_versions(conn, [table for table, _, _ in stats], previous_versions)
+            if not bulk:
+                conn.commit()
+            create_indexes(conn, analyze=False)
+            conn.isolation_level = None  # VACUUM can't run inside a transaction
+            finalize_database(conn)
+        finally:
+            conn.close()
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files as 0600
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    print_load_report(stats, "bulk" if bulk else "row-by-row")
+    print(f"✅ Database created at: {db_path}")
+
+# --- 5. INCREMENTAL SYNC ---
+# Natural key of every table. Keys are always the leading columns.
+TABLE_KEYS = {
+    "products":           ("product_id",),
+    "orders":             ("order_id",),
+    "order_items":        ("order_id", "product_id"),
+    "stores":             ("store_id",),
+    "store_inventory":    ("store_id", "product_id"),
+    "promotions":         ("promotion_id",),
+    "promotion_products": ("promotion_id", "product_id"),
+}
+
+def row_hash(row):
+    # Content hash of one row. Numbers are hashed as floats because a REAL
+    # column hands back 20.0 for a source value of 20.
+    values = [float(v) if isinstance(v, int) else v for v in row]
+    return hashlib.blake2b(json.dumps(values).encode(), digest_size=16).digest()
+
+def table_columns(conn, table):
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+def schema_matches(conn):
+    # An existing file built with an older schema can't be synced in place
+    expected = sqlite3.connect(":memory:")
+    create_schema(expected)
+    try:
+        return all(table_columns(conn, t) in ([], table_columns(expected, t)) for t in TABLE_KEYS)
+    finally:
+        expected.close()
+
+def sync_table(conn, table, rows):
+    columns = table_columns(conn, table)
+    n_keys = len(TABLE_KEYS[table])
+    non_key = columns[n_keys:]
+    insert_sql = TABLE_INSERTS[table]
+    key_clause = " AND ".join(f"{c} = ?" for c in columns[:n_keys])
+    # Key-only tables (promotion_products) never have updates, only inserts/deletes
+    update_sql = f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in non_key)} WHERE {key_clause}" if non_key else None
+    delete_sql = f"DELETE FROM {table} WHERE {key_clause}"
+
+    stored = {row[:n_keys]: row_hash(row) for row in conn.execute(f"SELECT {', '.join(columns)} FROM {table}")}
+
+    inserted = updated = unchanged = 0
+    inserts, updates = [], []
+    seen = set()
+    for row in rows:
+        key = row[:n_keys]
+        # A repeated key can't be diffed row by row: it would be re-inserted (and
+        # the table's version bumped) on every sync. The caller rolls back.
+        if key in seen:
+            raise ValueError(f"Duplicate key {dict(zip(TABLE_KEYS[table], key))} in the source rows for '{table}'")
+        seen.add(key)
+        old = stored.pop(key, None)
+        if old is None:
+            inserts.append(row)
+        elif old != row_hash(row):
+            updates.append(row[n_keys:] + key)
+        else:
+            unchanged += 1
+
+        if len(inserts) >= BATCH_SIZE:
+            conn.executemany(insert_sql, inserts)
+            inserted += len(inserts)
+            inserts = []
+        if len(updates) >= BATCH_SIZE:
+            conn.executemany(update_sql, updates)
+            updated += len(updates)
+            updates = []
+
+    if inserts:
+        conn.executemany(insert_sql, inserts)
+    if updates:
+        conn.executemany(update_sql, updates)
+    # Whatever is left in `stored` no longer exists in the source data
+    conn.executemany(delete_sql, stored.keys())
+    return inserted + len(inserts), updated + len(updates), unchanged, len(stored)
+
+def sync_database(streams=None, db_path=DB_PATH):
+    # Brings an existing DB in line with the raw data without deleting the file:
+    # only rows whose content hash changed are written, all in one transaction.
+    unshare_file(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if not schema_matches(conn):
+            conn.close()
+            print("⚠️  Existing database uses an older schema — rebuilding instead of syncing.")
+            create_database(streams=streams, db_path=db_path)
+            return None
+
+        counts = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            create_schema(conn)
+            for table, rows in streams or table_streams():
+                counts.append((table,) + sync_table(conn, table, rows))
+            changed = [table for table, ins, upd, _, dele in counts if ins or upd or dele]
+            bump_table_versions(conn, changed)
+            create_indexes(conn, analyze=bool(changed))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    print("🔄 Sync report:")
+    print(f"   {'table':<18} {'inserted':>9} {'updated':>9} {'unchanged':>10} {'deleted':>9}")
+    for table, ins, upd, same, dele in counts:
+        print(f"   {table:<18} {ins:>9,} {upd:>9,} {same:>10,} {dele:>9,}")
+    print(f"✅ Database synced at: {db_path}")
+    return counts
+
+# --- 6. QUERY PLAN CHECKS ---
+def check_query_plans(db_path=DB_PATH, queries=CANONICAL_QUERIES, allowed=KNOWN_SCANS):
+    # Runs EXPLAIN QUERY PLAN on every query and returns (sql, plan_step) pairs for
+    # each scan outside `allowed`. A scan of a covering index counts too: it still
+    # reads every entry, only from a narrower b-tree.
+    conn = sqlite3.connect(db_path)
+    failures = []
+    try:
+        for sql in queries:
+            if sql in allowed:
+                continue
+            for _, _, _, detail in conn.execute("EXPLAIN QUERY PLAN " + sql):
+                if detail.startswith("SCAN"):
+                    failures.append((sql, detail))
+    finally:
+        conn.close()
+    return failures
+
+def report_query_plans(db_path=DB_PATH, queries=CANONICAL_QUERIES):
+    failures = check_query_plans(db_path, queries)
+    if not failures:
+        known = sum(sql in KNOWN_SCANS for sql in queries)
+        print(f"✅ Query plans OK: {len(queries)} canonical queries, no scans besides {known} in KNOWN_SCANS")
+        return True
+    print(f"❌ {len(failures)} table scan(s) in canonical queries:")
+    for sql, detail in failures:
+        print(f"   {detail}  <-  {sql}")
+    return False
+
+
+# --- 7. FAQ KNOWLEDGE BASE ---
+FAQ_CONTENT = """
     RETURN POLICY
 
 Ohm Sweet Ohm offers a 30-day return policy on all items. Items must be in their original packaging and unused condition. To initiate a return, please contact customer service with your order number. Return shipping is free for defective items. For other returns, customers are responsible for return shipping costs unless the return is due to our error.
@@ -241,13 +765,354 @@ Once an order is placed, our warehouse begins processing it immediately to ensur
 REFUND TIMING
 Once your return is received and inspected at our warehouse (usually within 3 days of delivery), we will process your refund. The refund will be issued to your original payment method. Please allow 5-10 business days for your bank to post the refund to your account.
     """
-    
-    with open(FAQ_PATH, "w") as f:
-        f.write(faq_content.strip())
+
+def is_faq_heading(line):
+    # Section headings are short all-caps lines, e.g. "RETURN POLICY" or "STORE HOURS:"
+    line = line.strip()
+    return 0 < len(line) <= 60 and line == line.upper() and any(ch.isalpha() for ch in line)
+
+def faq_chunks(text=FAQ_CONTENT):
+    # Splits the FAQ into one (heading, body) chunk per section
+    chunks, heading, body = [], None, []
+    for line in text.strip().splitlines():
+        if is_faq_heading(line):
+            if heading and any(body):
+                chunks.append((heading, "\n".join(body).strip()))
+            heading, body = line.strip().rstrip(":"), []
+        elif heading:
+            body.append(line.strip())
+    if heading and any(body):
+        chunks.append((heading, "\n".join(body).strip()))
+    return chunks
+
+def create_faq_index(chunks, index_path=FAQ_INDEX_PATH):
+    # FTS5 inverted index over the FAQ sections, so look_up_policy gets BM25-ranked
+    # chunks without re-reading faq.txt. Published atomically like the product DB.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), prefix=".faq_index.", suffix=".db.tmp")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("CREATE VIRTUAL TABLE faq_chunks USING fts5(heading, body, tokenize='porter unicode61')")
+            conn.executemany("INSERT INTO faq_chunks (heading, body) VALUES (?, ?)", chunks)
+            conn.execute("INSERT INTO faq_chunks (faq_chunks) VALUES ('optimize')")
+            conn.commit()
+        finally:
+            conn.close()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def create_faq():
+    # Replaced rather than rewritten in place: the old file may be shared with the artifact cache
+    with open(FAQ_PATH + ".tmp", "w") as f:
+        f.write(FAQ_CONTENT.strip())
+    os.replace(FAQ_PATH + ".tmp", FAQ_PATH)
     print(f"✅ FAQ Knowledge Base created at: {FAQ_PATH}")
 
+    chunks = faq_chunks()
+    create_faq_index(chunks)
+    print(f"✅ FAQ search index ({len(chunks)} sections) created at: {FAQ_INDEX_PATH}")
+
+# --- 8. VECTOR INDEX ---
+# Dense index over the FAQ sections and product descriptions for the "Vector
+# Search" step of the policy route. Embeddings are TF-IDF over unigrams and
+# bigrams, randomly projected by signed feature hashing: every token lands in
+# one of EMBED_DIM buckets with a pseudo-random sign. That makes them local,
+# deterministic and network-free. The matrix is stored as a float32 .npy so
+# readers can memory-map it.
+
+def embedding_tokens(text):
+    # Crude plural folding so "refunds" and "refund" share a feature
+    words = [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+             for w in re.findall(r"\w+", text.lower())]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def hashed_features(text):
+    # {bucket: signed term count}; the top hash bit picks the sign
+    counts = {}
+    for token in embedding_tokens(text):
+        h = zlib.crc32(token.encode(), EMBED_SEED)
+        counts[h % EMBED_DIM] = counts.get(h % EMBED_DIM, 0) + (1 if h >> 31 else -1)
+    return counts
+
+def embed_texts(texts, idf):
+    # Returns an L2-normalised (len(texts), EMBED_DIM) float32 matrix
+    dense = np.zeros((len(texts), EMBED_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for bucket, count in hashed_features(text).items():
+            if count:
+                # Sublinear TF, keeping the sign of the hashed count
+                dense[row, bucket] = np.copysign(1.0 + np.log(abs(count)), count) * idf[bucket]
+    norms = np.linalg.norm(dense, axis=1, keepdims=True)
+    return dense / np.maximum(norms, 1e-12)
+
+def vector_documents(products=None):
+    # `products` are the product records the DB was built from; the fixture by default
+    docs = [{"id": f"faq:{heading}", "kind": "faq", "title": heading, "text": body} for heading, body in faq_chunks()]
+    docs += [{"id": f"product:{p['product_id']}", "kind": "product", "title": p['name'], "text": p['description']}
+             for p in (RAW_PRODUCTS if products is None else products)]
+    return docs
+
+def _publish_npy(path, shape, fill):
+    # Streams a float32 .npy into a temp file via a memmap, then swaps it in atomically
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".vectors.", suffix=".npy.tmp")
+    os.close(fd)
+    try:
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=shape)
+        fill(out)
+        out.flush()
+        del out
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def vector_index_files(index_path=VECTOR_INDEX_PATH):
+    # (idf path, docs path) of the index at `index_path`: the files next to it,
+    # named like the defaults, so an index directory is self-contained
+    directory = os.path.dirname(index_path)
+    return (os.path.join(directory, os.path.basename(VECTOR_IDF_PATH)),
+            os.path.join(directory, os.path.basename(VECTOR_DOCS_PATH)))
+
+def create_vector_index(docs=None, products=None, index_path=VECTOR_INDEX_PATH):
+    if np is None:
+        print("⚠️  numpy not installed — skipping vector index.")
+        return
+    docs = docs if docs is not None else vector_documents(products)
+    texts = [f"{d['title']}\n{d['text']}" for d in docs]
+
+    # Smoothed IDF over the hashed features
+    df = np.zeros(EMBED_DIM, dtype=np.float32)
+    for text in texts:
+        df[list(hashed_features(text))] += 1
+    idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+
+    def write_idf(out):
+        out[:] = idf
+
+    def write_vectors(out):
+        for start in range(0, len(texts), 1024):
+            out[start:start + 1024] = embed_texts(texts[start:start + 1024], idf)
+
+    idf_path, docs_path = vector_index_files(index_path)
+    _publish_npy(idf_path, idf.shape, write_idf)
+    _publish_npy(index_path, (len(texts), EMBED_DIM), write_vectors)
+    with open(docs_path + ".tmp", "w") as f:
+        for d in docs:
+            f.write(json.dumps(d) + "\n")
+    os.replace(docs_path + ".tmp", docs_path)
+    print(f"✅ Vector index ({len(docs)} documents × {EMBED_DIM} dims) created at: {index_path}")
+
+# --- 9. ARTIFACT CACHE ---
+# A finished build (DB, FAQ, FAQ index, vector index) is stored under CACHE_DIR
+# in a directory named by artifact_key(): a hash of SCHEMA_VERSION, the DDL, the
+# FAQ text and every input the build reads. A later setup with the same key
+# hardlinks (or, across filesystems, copies) the files into DATA_DIR instead of
+# rebuilding, after checking them against the checksums in the entry's
+# manifest. A DATA_DIR that already holds that key's files is left alone.
+# Cached files are shared, never written in place: every build publishes new
+# files with os.replace(), and sync_database() unshares the DB before writing.
+ARTIFACT_PATHS = [DB_PATH, FAQ_PATH, FAQ_INDEX_PATH, VECTOR_INDEX_PATH, VECTOR_IDF_PATH, VECTOR_DOCS_PATH]
+ARTIFACTS_STAMP = os.path.join(DATA_DIR, ".artifacts.json")
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def artifact_key(input_files=None, synthetic=None):
+    # `input_files` as from find_input_files(); `synthetic` as (n_products, n_orders, n_stores, seed)
+    inputs = {entity: file_sha256(path) for entity, path in sorted((input_files or {}).items())}
+    parts = {
+        "schema_version": SCHEMA_VERSION,
+        "ddl":            TABLE_DEFINITIONS + INDEX_DEFINITIONS,
+        "fixture":        INPUT_FILES,   # also feeds the vector index and synthetic templates
+        "faq":            FAQ_CONTENT,
+        "inputs":         inputs,
+        "synthetic":      synthetic,
+        "vectors":        [EMBED_DIM, EMBED_SEED] if np is not None else None,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:32]
+
+def _link_or_copy(src, dst):
+    # Publishes src at dst atomically, sharing the file where the filesystem allows it
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dst), prefix=".artifact.", suffix=".tmp")
+    os.close(fd)
+    os.remove(tmp_path)
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def unshare_file(path):
+    # Gives a hardlinked file its own copy, so writing to it can't touch the cache
+    if os.path.exists(path) and os.stat(path).st_nlink > 1:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".unshare.", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copy2(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+def _stat_signature(path):
+    st = os.stat(path)
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+def _write_stamp(key, paths):
+    with open(ARTIFACTS_STAMP + ".tmp", "w") as f:
+        json.dump({"key": key, "files": {os.path.basename(p): _stat_signature(p) for p in paths}}, f)
+    os.replace(ARTIFACTS_STAMP + ".tmp", ARTIFACTS_STAMP)
+
+def artifacts_current(key):
+    # True if DATA_DIR still holds exactly the files a previous setup published for `key`
+    try:
+        with open(ARTIFACTS_STAMP) as f:
+            stamp = json.load(f)
+        return stamp["key"] == key and all(
+            _stat_signature(os.path.join(DATA_DIR, name)) == signature for name, signature in stamp["files"].items())
+    except (OSError, ValueError, KeyError):
+        return False
+
+def store_artifacts(key, cache_dir=CACHE_DIR):
+    entry = os.path.join(cache_dir, key)
+    paths = [p for p in ARTIFACT_PATHS if os.path.exists(p)]
+    if not os.path.isdir(entry):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Assembled in a temp dir and renamed into place, so a half-written entry is never visible
+        tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix=f".{key}.")
+        try:
+            manifest = {"key": key, "schema_version": SCHEMA_VERSION, "created": time.time(), "files": {}}
+            for path in paths:
+                name = os.path.basename(path)
+                _link_or_copy(path, os.path.join(tmp_dir, name))
+                manifest["files"][name] = {"sha256": file_sha256(path), "size": os.path.getsize(path)}
+            with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.rename(tmp_dir, entry)
+        except OSError:
+            # Another setup published the same key first; theirs is as good as ours
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
+        print(f"✅ Cached build artifacts at: {entry}")
+    _write_stamp(key, paths)
+    prune_cache(cache_dir)
+
+def restore_artifacts(key, cache_dir=CACHE_DIR):
+    # Returns True if DATA_DIR now holds the artifacts for `key`, False if they must be built
+    if artifacts_current(key):
+        print(f"✅ Build artifacts already up to date ({key[:12]}) — nothing to do.")
+        return True
+    entry = os.path.join(cache_dir, key)
+    try:
+        with open(os.path.join(entry, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    for name, meta in manifest["files"].items():
+        path = os.path.join(entry, name)
+        if not os.path.exists(path) or os.path.getsize(path) != meta["size"] or file_sha256(path) != meta["sha256"]:
+            print(f"⚠️  Cached {name} in {entry} failed verification — discarding the entry and rebuilding.")
+            shutil.rmtree(entry, ignore_errors=True)
+            return False
+
+    paths = []
+    for name in manifest["files"]:
+        path = os.path.join(DATA_DIR, name)
+        _link_or_copy(os.path.join(entry, name), path)
+        paths.append(path)
+    os.utime(os.path.join(entry, "manifest.json"))  # marks the entry as recently used for prune_cache()
+    _write_stamp(key, paths)
+    print(f"✅ Restored {len(paths)} prebuilt artifacts from cache: {entry}")
+    return True
+
+def prune_cache(cache_dir=CACHE_DIR, keep=CACHE_KEEP):
+    entries = []
+    for name in os.listdir(cache_dir):
+        manifest = os.path.join(cache_dir, name, "manifest.json")
+        if not name.startswith(".") and os.path.exists(manifest):
+            entries.append((os.path.getmtime(manifest), name))
+    for _, name in sorted(entries, reverse=True)[keep:]:
+        shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Ohm Sweet Ohm lab environment.")
+    parser.add_argument("--row-by-row", action="store_true",
+                        help="use the original one-INSERT-per-row loader instead of the bulk loader")
+    parser.add_argument("--sync", action="store_true",
+                        help="update an existing database in place, writing only rows that changed")
+    parser.add_argument("--products", type=int, help="generate a synthetic catalog with this many products")
+    parser.add_argument("--orders", type=int, help="number of synthetic orders (with 1-3 items each)")
+    parser.add_argument("--stores", type=int, help="number of synthetic stores, each stocking every product")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the synthetic catalog")
+    parser.add_argument("--input-dir",
+                        help="load <entity>.jsonl[.gz] files (products, orders, stores, promotions) from this "
+                             "directory instead of the built-in fixture")
+    parser.add_argument("--export-fixture", metavar="DIR",
+                        help="write the built-in fixture as .jsonl.gz input files to DIR and exit")
+    parser.add_argument("--check-plans", action="store_true",
+                        help="verify the canonical queries use indexes; exit 1 on any scan not in KNOWN_SCANS")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="prebuilt artifact cache [OHM_CACHE_DIR]")
+    parser.add_argument("--no-cache", action="store_true", help="always build from scratch and don't cache the result")
+    args = parser.parse_args()
+
+    if args.export_fixture:
+        export_fixture(args.export_fixture)
+        sys.exit(0)
+
+    streams = None
+    input_files, synthetic = None, None
+    if args.input_dir:
+        if args.products or args.orders or args.stores:
+            parser.error("--input-dir cannot be combined with a synthetic catalog")
+        input_files = find_input_files(args.input_dir)
+        if not input_files:
+            parser.error(f"no input files found in {args.input_dir}")
+        for entity in INPUT_FILES:
+            print(f"📥 {entity}: {input_files.get(entity, 'built-in fixture')}")
+        streams = file_table_streams(**input_files)
+    elif args.products or args.orders or args.stores:
+        n_products, n_orders, n_stores = args.products or 0, args.orders or 0, args.stores or 0
+        synthetic = (n_products, n_orders, n_stores, args.seed)
+        print(f"🧪 Generating synthetic catalog (seed {args.seed}): {n_products:,} products, "
+              f"{n_orders:,} orders, {n_stores:,} stores")
+        streams = synthetic_table_streams(n_products, n_orders, n_stores, args.seed)
+
+    # The vector index covers the same products as the DB; read lazily, only if it is built
+    input_products = read_records(input_files["products"]) if input_files and "products" in input_files else None
+
     setup_directories()
-    create_database()
-    create_faq()
+    if args.sync and os.path.exists(DB_PATH):
+        sync_database(streams)
+        create_faq()
+        create_vector_index(products=input_products)
+    else:
+        # The row-by-row loader only exists to be timed, so it always builds
+        key = None if args.no_cache or args.row_by_row else artifact_key(input_files, synthetic)
+        if key is None or not restore_artifacts(key, args.cache_dir):
+            create_database(bulk=not args.row_by_row, streams=streams)
+            create_faq()
+            create_vector_index(products=input_products)
+            if key is not None:
+                store_artifacts(key, args.cache_dir)
+    if args.check_plans and not report_query_plans():
+        sys.exit(1)
     print("🚀 Lab Environment Ready! You can now run the agent.")
\ No newline at end of file
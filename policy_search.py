@@ -0,0 +1,108 @@
+"""
+policy_search.py
+Retrieval backend for the chatbot's look_up_policy tool (the POLICY route in
+seed_data.POLICY_TURNS). Queries the section-level FTS5 index that
+lab_setup.create_faq() builds next to the product DB and returns the top-k FAQ
+sections ranked by BM25. It does not re-read and scan faq.txt on every question.
+vector_search() is the dense "Vector Search" counterpart over the FAQ sections
+plus product descriptions (needs numpy).
+
+    from policy_search import look_up_policy, vector_search
+    look_up_policy("How long do refunds take?", k=2)
+    vector_search(["noise cancelling headphones", "store opening hours"], k=3)
+"""
+
+import os
+import re
+import json
+import sqlite3
+import threading
+
+import lab_setup
+
+# Heading matches count for more than body matches
+HEADING_WEIGHT = 5.0
+BODY_WEIGHT    = 1.0
+
+_local = threading.local()
+
+def _connection(index_path):
+    # One read-only connection per thread and index file, opened on first use and
+    # reopened once lab_setup republishes the file: an open connection would keep
+    # reading the replaced (unlinked) one forever
+    st = os.stat(index_path)
+    sig = (st.st_ino, st.st_mtime_ns)
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    cached = conns.get(index_path)
+    if cached is None or cached[0] != sig:
+        if cached is not None:
+            cached[1].close()
+        cached = conns[index_path] = (sig, sqlite3.connect(f"file:{index_path}?mode=ro", uri=True))
+    return cached[1]
+
+def fts_query(text):
+    # Turns free text into an FTS5 OR-query of quoted terms, so user input can
+    # never be parsed as FTS5 syntax (column filters, NEAR, unbalanced quotes...)
+    terms = dict.fromkeys(re.findall(r"\w+", text.lower()))
+    return " OR ".join(f'"{t}"' for t in terms)
+
+def look_up_policy(question, k=3, index_path=lab_setup.FAQ_INDEX_PATH):
+    query = fts_query(question)
+    if not query:
+        return []
+    rows = _connection(index_path).execute(
+        "SELECT heading, body, bm25(faq_chunks, ?, ?) AS score FROM faq_chunks "
+        "WHERE faq_chunks MATCH ? ORDER BY score LIMIT ?",
+        (HEADING_WEIGHT, BODY_WEIGHT, query, k),
+    ).fetchall()
+    # bm25() is lower-is-better; flip the sign so callers get higher-is-better
+    return [{"heading": h, "body": b, "score": -score} for h, b, score in rows]
+
+# ──────────────────────────────────────────────────────────────────────────────
+# VECTOR SEARCH
+# Dense retrieval over the index from lab_setup.create_vector_index(). The
+# matrix is memory-mapped, and each call scores a whole batch of queries with
+# one matrix product, so adding queries or documents adds no Python-level loop.
+# ──────────────────────────────────────────────────────────────────────────────
+_vector_lock  = threading.Lock()
+_vector_cache = {}
+
+def _vector_index(index_path):
+    # (vectors memmap, idf, docs), reloaded whenever lab_setup republishes the files
+    np = lab_setup.np
+    mtime = os.stat(index_path).st_mtime_ns
+    with _vector_lock:
+        cached = _vector_cache.get(index_path)
+        if cached is None or cached[0] != mtime:
+            idf_path, docs_path = lab_setup.vector_index_files(index_path)
+            vectors = np.load(index_path, mmap_mode="r")
+            idf = np.load(idf_path)
+            with open(docs_path) as f:
+                docs = [json.loads(line) for line in f]
+            cached = _vector_cache[index_path] = (mtime, vectors, idf, docs)
+    return cached[1:]
+
+def vector_search(queries, k=3, kind=None, index_path=lab_setup.VECTOR_INDEX_PATH):
+    # `queries` is one string or a list of strings; returns one ranked hit list per
+    # query. `kind` restricts hits to "faq" or "product" documents. Only documents
+    # scoring above zero count as hits, so a query with no known words finds nothing.
+    np = lab_setup.np
+    single = isinstance(queries, str)
+    queries = [queries] if single else list(queries)
+    if k <= 0:
+        return [] if single else [[] for _ in queries]
+    vectors, idf, docs = _vector_index(index_path)
+
+    scores = lab_setup.embed_texts(queries, idf) @ vectors.T
+    if kind is not None:
+        scores[:, [d["kind"] != kind for d in docs]] = -np.inf
+    k = min(k, len(docs))
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+    results = []
+    for row, candidates in enumerate(top):
+        ranked = candidates[np.argsort(-scores[row, candidates])]
+        results.append([dict(docs[i], score=float(scores[row, i])) for i in ranked if scores[row, i] > 0])
+    return results[0] if single else results
@@ -0,0 +1,291 @@
+"""
+router.py
+Local fast path for the chatbot's route_user_request step. Every request
+otherwise starts with an LLM call (the router span in seed_data.log_trace,
+0.3–0.9 s) just to pick DATABASE, POLICY or CHAT. RouterModel is a softmax
+regression over the hashed word uni/bigram features lab_setup already uses for
+embeddings, trained in pure Python on seed_data's labelled turn corpora
+(questions and their follow-ups). It classifies a question in microseconds.
+route_user_request() trusts it at or above CONFIDENCE_THRESHOLD and calls the
+LLM router only below it.
+
+The raw softmax confidences are overconfident, and cross-validated fast-path
+accuracy was not monotonic in them. Probabilities are therefore temperature-scaled
+with TEMPERATURE, fitted on the cross-validated scores. CONFIDENCE_THRESHOLD is
+the lowest threshold whose fast path stays at or above TARGET_FAST_ACCURACY at
+every higher threshold too. Raising the target makes the fast path more accurate,
+but fewer requests take it, so more of them pay for the LLM router span. --eval
+prints the fitted values and the whole coverage/accuracy trade-off, so the
+constants can be re-read from it whenever the corpora change.
+
+    from router import route_user_request
+    route_user_request("What's the price of AUDIO-101?")                  # {"route": "DATABASE", "confidence": ..., "source": "classifier"}
+    route_user_request("Can you help with something?", llm=my_llm_router) # falls back when unsure
+
+    python router.py --eval --output router_eval.json   # cross-validated accuracy and latency saved
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import statistics
+import threading
+from datetime import datetime, timezone
+
+import lab_setup
+import seed_data
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CONFIG
+# ──────────────────────────────────────────────────────────────────────────────
+ROUTES               = seed_data.ROUTES
+TEMPERATURE          = 1.69   # softmax temperature, as fitted by --eval
+TARGET_FAST_ACCURACY = 0.9
+CONFIDENCE_THRESHOLD = 0.70   # below this, route_user_request() asks the LLM; as recommended by --eval
+EPOCHS               = 40
+LEARNING_RATE        = 0.5
+L2                   = 1e-4
+SEED                 = 42
+EVAL_THRESHOLDS      = [0.5, 0.6, 0.65, 0.7, 0.75, 0.8]
+
+# ──────────────────────────────────────────────────────────────────────────────
+# TRAINING DATA
+# Follow-ups take their conversation's route: the corpora keep each thread on
+# topic, and the odd off-topic follow-up mostly lands below the threshold.
+# ──────────────────────────────────────────────────────────────────────────────
+def labelled_examples():
+    # [(text, route index, group)], where a group is one turn dict and its follow-ups
+    examples = []
+    for route, turns in enumerate(seed_data.ROUTE_TURNS):
+        for i, turn in enumerate(turns):
+            group = f"{ROUTES[route]}:{i}"
+            examples.append((turn["question"], route, group))
+            examples += [(question, route, group) for question, _ in turn.get("follow_ups", [])]
+    return examples
+
+def features(text):
+    # [(bucket, value)], L2-normalised so long and short questions score alike
+    counts = lab_setup.hashed_features(text)
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return [(bucket, v / norm) for bucket, v in counts.items()]
+
+def softmax(scores):
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MODEL
+# ──────────────────────────────────────────────────────────────────────────────
+class RouterModel:
+    def __init__(self, weights, bias, temperature=TEMPERATURE):
+        self.weights     = weights   # {bucket: [weight per route]}, only buckets seen in training
+        self.bias        = bias
+        self.temperature = temperature
+
+    @classmethod
+    def train(cls, examples, epochs=EPOCHS, learning_rate=LEARNING_RATE, l2=L2, seed=SEED):
+        # Plain SGD on the cross-entropy loss, in a fixed shuffled order per seed
+        n_routes = len(ROUTES)
+        data = [(features(text), route) for text, route, _ in examples]
+        weights, bias = {}, [0.0] * n_routes
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + 0.1 * epoch)
+            rng.shuffle(data)
+            for x, route in data:
+                scores = list(bias)
+                for bucket, value in x:
+                    w = weights.setdefault(bucket, [0.0] * n_routes)
+                    for k in range(n_routes):
+                        scores[k] += w[k] * value
+                probs = softmax(scores)
+                for k in range(n_routes):
+                    grad = probs[k] - (k == route)
+                    bias[k] -= rate * grad
+                    for bucket, value in x:
+                        w = weights[bucket]
+                        w[k] -= rate * (grad * value + l2 * w[k])
+        return cls(weights, bias)
+
+    def scores(self, text):
+        # Uncalibrated per-route logits
+        scores = list(self.bias)
+        for bucket, value in features(text):
+            w = self.weights.get(bucket)
+            if w is not None:
+                for k in range(len(scores)):
+                    scores[k] += w[k] * value
+        return scores
+
+    def probabilities(self, text):
+        return softmax([s / self.temperature for s in self.scores(text)])
+
+    def predict(self, text):
+        # (route name, confidence)
+        probs = self.probabilities(text)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return ROUTES[best], probs[best]
+
+_model      = None
+_model_lock = threading.Lock()
+
+def get_model():
+    # Trained on first use from the full corpus; takes well under a second
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = RouterModel.train(labelled_examples())
+        return _model
+
+def route_user_request(question, llm=None, threshold=CONFIDENCE_THRESHOLD, model=None):
+    # `llm(question)` is the LLM router, returning a route name. Without one, the
+    # classifier's best guess is returned whatever its confidence.
+    route, confidence = (model or get_model()).predict(question)
+    if confidence < threshold and llm is not None:
+        return {"route": llm(question), "confidence": confidence, "source": "llm"}
+    return {"route": route, "confidence": confidence, "source": "classifier"}
+
+# ──────────────────────────────────────────────────────────────────────────────
+# EVALUATION
+# Leave-one-group-out cross-validation: every turn dict is predicted by a model
+# trained without it or its follow-ups, so the numbers reflect unseen
+# conversations, not memorised ones. The temperature is fitted on those held-out
+# scores, and the thresholds are applied to the calibrated confidences. A request
+# below the threshold is counted as answered correctly by the LLM, at the cost of
+# a router span.
+# ──────────────────────────────────────────────────────────────────────────────
+def cross_validate(examples):
+    # [(true route index, uncalibrated scores)] for every example
+    results = []
+    for group in dict.fromkeys(g for _, _, g in examples):
+        model = RouterModel.train([e for e in examples if e[2] != group])
+        for text, route, g in examples:
+            if g == group:
+                results.append((route, model.scores(text)))
+    return results
+
+def log_loss(results, temperature):
+    return -sum(math.log(softmax([s / temperature for s in scores])[route]) for route, scores in results) / len(results)
+
+def fit_temperature(results, low=0.05, high=20.0, steps=400):
+    # Grid search on a log scale; the loss is smooth and one-dimensional
+    grid = [low * (high / low) ** (i / steps) for i in range(steps + 1)]
+    return min(grid, key=lambda t: log_loss(results, t))
+
+def calibrate(results, temperature):
+    # [(true route index, predicted route index, confidence)]
+    calibrated = []
+    for route, scores in results:
+        probs = softmax([s / temperature for s in scores])
+        best = max(range(len(probs)), key=probs.__getitem__)
+        calibrated.append((route, best, probs[best]))
+    return calibrated
+
+def recommend_threshold(calibrated, target):
+    # The lowest confidence at which the fast path, and the fast path of every
+    # higher threshold, is at least `target` accurate; None if none qualifies
+    ranked = sorted(calibrated, key=lambda r: -r[2])
+    threshold, correct = None, 0
+    for i, (route, predicted, confidence) in enumerate(ranked, 1):
+        correct += route == predicted
+        if correct / i < target:
+            break
+        if i == len(ranked) or ranked[i][2] < confidence:   # don't split tied confidences
+            threshold = confidence
+    return threshold
+
+def router_span_seconds(route):
+    low, high = seed_data.SPAN_SECONDS[route][0]
+    return (low + high) / 2
+
+def threshold_report(results, threshold):
+    fast = [(route, predicted) for route, predicted, confidence in results if confidence >= threshold]
+    fast_correct = sum(route == predicted for route, predicted in fast)
+    saved = sum(router_span_seconds(route) for route, predicted, confidence in results if confidence >= threshold)
+    return {
+        "threshold":        threshold,
+        "coverage":         len(fast) / len(results),
+        "fast_accuracy":    fast_correct / len(fast) if fast else None,
+        "overall_accuracy": (fast_correct + len(results) - len(fast)) / len(results),
+        "llm_calls_saved":  len(fast),
+        "llm_secs_saved_per_1k": 1000 * saved / len(results),
+    }
+
+def predict_latency_us(model, texts, rounds=200):
+    samples = []
+    for _ in range(rounds):
+        for text in texts:
+            start = time.perf_counter()
+            model.predict(text)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {"p50_us": statistics.median(samples), "p99_us": samples[int(len(samples) * 0.99)]}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate the local router against the labelled turn corpora.")
+    parser.add_argument("--eval", action="store_true", help="run the offline evaluation (the only mode for now)")
+    parser.add_argument("--output", help="where to write machine-readable results")
+    args = parser.parse_args(argv)
+    if not args.eval:
+        parser.error("nothing to do; pass --eval")
+
+    examples = labelled_examples()
+    start = time.perf_counter()
+    model = RouterModel.train(examples)
+    train_secs = time.perf_counter() - start
+    results = cross_validate(examples)
+    temperature = fit_temperature(results)
+    calibrated = calibrate(results, temperature)
+    recommended = recommend_threshold(calibrated, TARGET_FAST_ACCURACY)
+    latency = predict_latency_us(model, [text for text, _, _ in examples])
+
+    report = {
+        "meta": {
+            "timestamp":  datetime.now(timezone.utc).isoformat(),
+            "python":     platform.python_version(),
+            "platform":   platform.platform(),
+            "examples":   len(examples),
+            "groups":     len({g for _, _, g in examples}),
+            "train_secs": train_secs,
+            "seed":       SEED,
+        },
+        "latency":    latency,
+        "calibration": {
+            "temperature":  temperature,
+            "log_loss_raw": log_loss(results, 1.0),
+            "log_loss":     log_loss(results, temperature),
+        },
+        "target_fast_accuracy":  TARGET_FAST_ACCURACY,
+        "recommended_threshold": recommended,
+        "thresholds": [threshold_report(calibrated, t) for t in EVAL_THRESHOLDS],
+    }
+
+    print(f"\n🧭 Router: {len(examples)} examples in {report['meta']['groups']} conversations, "
+          f"trained in {train_secs * 1000:.0f} ms; predict p50 {latency['p50_us']:.1f} µs, p99 {latency['p99_us']:.1f} µs")
+    calibration = report["calibration"]
+    print(f"   Temperature {temperature:.2f} (TEMPERATURE = {TEMPERATURE}), held-out log loss "
+          f"{calibration['log_loss_raw']:.3f} -> {calibration['log_loss']:.3f}")
+    recommended_text = f"{recommended:.2f}" if recommended is not None else "none"
+    print(f"   Recommended threshold for ≥{TARGET_FAST_ACCURACY:.0%} fast-path accuracy: {recommended_text} "
+          f"(CONFIDENCE_THRESHOLD = {CONFIDENCE_THRESHOLD})")
+    print(f"   {'threshold':>9} {'coverage':>9} {'fast acc':>9} {'overall':>9} {'LLM s saved/1k req':>19}")
+    for r in report["thresholds"]:
+        fast_accuracy = f"{r['fast_accuracy']:.1%}" if r["fast_accuracy"] is not None else "-"
+        marker = "  ◀ default" if r["threshold"] == CONFIDENCE_THRESHOLD else ""
+        print(f"   {r['threshold']:>9.2f} {r['coverage']:>9.1%} {fast_accuracy:>9} {r['overall_accuracy']:>9.1%} "
+              f"{r['llm_secs_saved_per_1k']:>19,.0f}{marker}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,51 +3,147 @@ seed_data.py
 Populates the OhmSweetOhm-Support-Chatbot-Opik-Workshop Opik project with 30 days
 of synthetic production traces. Skips automatically if data already exists.
 
+    python seed_data.py                                  # seed with the defaults below
+    python seed_data.py --target-traces 1000000 --time-model diurnal --sink local
+    python seed_data.py replay data/traces               # upload a local sink directory
+
+Importing the module has no side effects: opik, numpy and tqdm load on first
+use and the Opik client is created only when a sink needs it, so other tools
+can reuse the conversation corpora and the trace builder. Every flag defaults
+to its SEED_* environment variable (see CONFIG).
+
 Note on Historical Timestamps:
 Traces are created with historical start_time and end_time values to simulate
 production data from the past 30 days. To ensure traces appear in dashboards
-under their historical dates (not ingestion date), trace and span IDs are generated
-using id_helpers.generate_id() with the historical timestamp. This is critical
-for proper date grouping in Opik dashboards.
+under their historical dates (not ingestion date), trace and span IDs are UUIDv7s
+built from the historical timestamp (the layout of id_helpers.uuid4_to_uuid7).
+This is critical for proper date grouping in Opik dashboards. The random part
+of each ID is drawn with the rest of the thread, so a rerun produces the same
+IDs and re-sent traces overwrite rather than duplicate.
+
+Conversation threads are seeded in parallel (--workers, default 8). Their
+random draws come in fixed chunks of threads from generators derived from
+SEED_MASTER_SEED, so a given seed yields the same traces whatever the worker
+count. With numpy installed each chunk is drawn column-wise in a few vectorised
+calls; without it (or with --sampler python) the same distributions are
+drawn in pure Python, a different but equally reproducible stream.
+
+For load tests, --target-traces generates exactly that many traces (into the
+millions) over --days-back days, with --time-model diurnal for daily and
+weekly traffic curves. Threads are planned lazily and only a bounded window is
+in flight, so memory stays flat and a slow sink throttles generation.
+
+Progress is checkpointed to --checkpoint (data/seed_checkpoint.json) after
+each sink flush. Rerunning an interrupted seed resumes at the next thread,
+and a finished one skips without contacting the backend.
+
+--sink local writes the traces to gzip JSONL under --sink-dir instead of
+sending them, with no backend needed; `python seed_data.py replay DIR` uploads
+such a directory later in bulk.
+
+Every trace sent to Opik carries the agent graph, since Opik has no way to
+refer to a graph defined elsewhere. The local sink can store it only on the
+first trace of each thread (--graph thread) or of the whole run (--graph
+project), with the rest naming it by reference; replay puts the full graph
+back before upload. The local sink also stores the static prompt and
+conversation text once in a string table. Both sinks report the bytes saved
+per trace.
 """
 
 import os
 import sys
-import opik
-from opik import id_helpers
+import gc
+import gzip
+import json
+import hashlib
+import argparse
+import importlib.util
 import random
-import uuid
+import time
+import queue
+import bisect
+import tempfile
+import itertools
+import collections
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta, timezone
 
 # ── tqdm is already available in Colab; fall back gracefully if not ────────────
-try:
-    from tqdm.auto import tqdm
-except ImportError:
-    def tqdm(iterable, **kwargs):
+def tqdm(iterable, **kwargs):
+    # Imported on first use: tqdm.auto pulls in IPython detection, too slow for module import
+    try:
+        from tqdm.auto import tqdm as progress
+    except ImportError:
         print(kwargs.get("desc", ""), "...")
         return iterable
+    return progress(iterable, **kwargs)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # CONFIG
+# Defaults for main()'s flags, each overridable through its environment
+# variable. main() writes the parsed values back here, where the rest of the
+# module reads them.
 # ──────────────────────────────────────────────────────────────────────────────
 PROJECT_NAME = os.environ.get("OPIK_PROJECT_NAME", "OhmSweetOhm-Support-Chatbot-Opik-Workshop")
-NUM_THREADS  = 100
-DAYS_BACK    = 30
+NUM_THREADS  = int(os.environ.get("SEED_THREADS", "100"))
+# When set, generate exactly this many traces (any number of threads) instead of NUM_THREADS threads
+TARGET_TRACES = int(os.environ.get("SEED_TARGET_TRACES", "0"))
+DAYS_BACK    = float(os.environ.get("SEED_DAYS_BACK", "30"))
+# Thread start times: "beta" (skewed to recent days) or "diurnal" (daily + weekly traffic curve)
+TIME_MODEL   = os.environ.get("SEED_TIME_MODEL", "beta")
 MODEL        = "gpt-5"
+# Conversation threads logged concurrently; 1 reproduces the old sequential run
+NUM_WORKERS  = int(os.environ.get("SEED_WORKERS", "8"))
+# Threads queued or running at once; the planner waits for a slot, which bounds memory
+MAX_IN_FLIGHT = 4 * NUM_WORKERS
+# Every thread's RNG derives from this, so a given seed always yields the same data
+MASTER_SEED  = int(os.environ.get("SEED_MASTER_SEED", "42"))
+# Threads sampled per generator; part of the seed's meaning, so changing it changes the data
+PLAN_CHUNK   = 1024
+# "numpy" (vectorised, the default when installed) or "python"; the two draw different streams.
+# numpy itself is only imported once the sampler runs.
+HAVE_NUMPY   = importlib.util.find_spec("numpy") is not None
+SAMPLER      = os.environ.get("SEED_SAMPLER", "numpy" if HAVE_NUMPY else "python")
+# Bulk request limits: items per request, and bytes kept under the backend's 5 MB cap
+BATCH_MAX_ITEMS = int(os.environ.get("SEED_BATCH_ITEMS", "1000"))
+BATCH_MAX_BYTES = 4 * 1024 * 1024
+# Failed requests are retried with jittered exponential backoff (seconds). A thread-score
+# batch that still fails is dropped; a trace or span batch fails the run, which then
+# resumes from its last checkpoint.
+SEND_MAX_ATTEMPTS  = 6
+SCORE_MAX_ATTEMPTS = 6
+RETRY_BACKOFF      = 1.0
+RETRY_BACKOFF_MAX  = 30.0
+# "opik" sends to the backend; "local" writes gzip JSONL under SINK_DIR for a later replay
+SINK         = os.environ.get("SEED_SINK", "opik")
+SINK_DIR     = os.environ.get("SEED_SINK_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "traces"))
+# Traces that carry the full MERMAID_GRAPH: every "trace" (the only mode Opik displays
+# correctly), or, for the local sink only, the first of each "thread" or of the "project"
+GRAPH_MODE   = os.environ.get("SEED_GRAPH", "trace")
+# Progress file for resuming an interrupted seed; rewritten every CHECKPOINT_EVERY threads
+CHECKPOINT_PATH  = os.environ.get("SEED_CHECKPOINT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "seed_checkpoint.json"))
+CHECKPOINT_EVERY = int(os.environ.get("SEED_CHECKPOINT_EVERY", "1000"))
 
 # ──────────────────────────────────────────────────────────────────────────────
-# SKIP GUARD
+# CLIENT
+# Configured and created on first use, never on import; the local sink never
+# needs one.
 # ──────────────────────────────────────────────────────────────────────────────
-opik.configure(use_local=False)
-client = opik.Opik(project_name=PROJECT_NAME)
+_client      = None
+_client_lock = threading.Lock()
 
-try:
-    existing = client.search_traces(project_name=PROJECT_NAME, max_results=1)
-    if existing:
-        print("✅ Demo data already exists — skipping seed.")
-        sys.exit(0)
-except Exception:
-    pass
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            import opik
+            # With OPIK_URL_OVERRIDE set (a self-hosted backend, or bench_ingest.py's stand-in)
+            # the client takes everything from the environment; configure() would reset it to the cloud URL
+            if not os.environ.get("OPIK_URL_OVERRIDE"):
+                opik.configure(use_local=False)
+            _client = opik.Opik(project_name=PROJECT_NAME)
+        return _client
 
 # ──────────────────────────────────────────────────────────────────────────────
 # CONVERSATION DATA
@@ -128,7 +224,7 @@ DATABASE_TURNS = [
     {
         "question": "Are there any deals on gaming products right now?",
         "answer":   "Yes! There's currently a 20% discount on all GAME category products through end of month.",
-        "sql":      "SELECT p.name, pr.discount_percent FROM promotions pr JOIN products p ON pr.product_ids LIKE '%' || p.product_id || '%' WHERE p.category = 'GAME'",
+        "sql":      "SELECT p.name, pr.discount_percent FROM products p JOIN promotion_products pp ON pp.product_id = p.product_id JOIN promotions pr ON pr.promotion_id = pp.promotion_id WHERE p.category = 'GAME'",
         "follow_ups": [
             ("Does that include the NexGen Pro Console?", "Yes, the NexGen Pro Gaming Console is included in the promotion — 20% off brings it to $399.99."),
             ("What about the ProGamer Controller?",    "Yes, the ProGamer Controller is also 20% off, down to $55.99 from $69.99."),
@@ -268,298 +364,1082 @@ SQL-->SQLTool[DB Query];
 RAG-->RAGTool[Vector Search];
 Chat-->End(Response);"""
 
+# Static prompt blocks repeated across spans
+POLICY_SYSTEM_PROMPT = "You are a policy assistant. Use the handbook."
+CHAT_SYSTEM_PROMPT   = "You are a helpful customer support assistant."
+SQL_RESULT_TABLE     = "| col1 | col2 |\n|------|------|\n| val1 | val2 |"
+CLOSING_TURN         = ("Thanks, that's all I needed!", "Happy to help! Don't hesitate to reach out if anything comes up.")
+
 # ──────────────────────────────────────────────────────────────────────────────
-# HELPERS
+# DISTRIBUTIONS
+# Every random quantity in a thread, as tables that both samplers (NumPy and
+# pure Python, see SAMPLERS) draw from, so the two paths match in distribution.
 # ──────────────────────────────────────────────────────────────────────────────
-def make_usage(in_lo, in_hi, out_lo, out_hi):
-    p = random.randint(in_lo, in_hi)
-    c = random.randint(out_lo, out_hi)
-    return {"prompt_tokens": p, "completion_tokens": c, "total_tokens": p + c}
+ROUTES      = ["DATABASE", "POLICY", "CHAT"]   # in ROUTE_WEIGHTS order
+ROUTE_TURNS = [DATABASE_TURNS, POLICY_TURNS, CHAT_TURNS]
+CHAT        = ROUTES.index("CHAT")
+
+# Weights adjusted to average ~3 traces per thread: [5, 20, 50, 25] for [1, 2, 3, 4] turns
+# Expected value: 1*0.05 + 2*0.20 + 3*0.50 + 4*0.25 = 2.95 ≈ 3 traces per thread
+TURN_COUNTS  = [1, 2, 3, 4]
+TURN_WEIGHTS = [5, 20, 50, 25]
+MAX_TURNS    = max(TURN_COUNTS)
+MAX_FOLLOW_UPS = max(len(d.get("follow_ups", [])) for turns in ROUTE_TURNS for d in turns)
+
+HELPFULNESS_SCORES  = [1.0, 0.75, 0.5, 0.25, 0.0]
+HELPFULNESS_WEIGHTS = [45, 30, 15, 7, 3]
+FRUSTRATION_SCORES  = [0.0, 0.1, 0.3, 0.6, 0.9, 1.0]
+FRUSTRATION_WEIGHTS = [35, 25, 20, 10, 7, 3]
+
+TRACE_SECONDS    = (1.2, 9.0)
+TURN_GAP_MINUTES = (2, 8)      # turn N starts N × this many minutes into the thread
+N_RESULTS        = (1, 3)      # policy chunks retrieved
+
+# Per route, the four span slots: the router, then the workflow's steps.
+# (low, high) seconds, and (prompt low, high, completion low, high) tokens;
+# tool spans and slots a route doesn't use are zeros.
+MAX_SPANS    = 4
+SPAN_SECONDS = [
+    [(0.3, 0.9), (0.8, 2.5), (0.05, 0.3), (0.5, 1.5)],   # DATABASE: router, SQL generation, run_sql_query, final answer
+    [(0.3, 0.9), (0.6, 1.8), (0.1, 0.5),  (0.6, 2.0)],   # POLICY:   router, query generation, look_up_policy, final answer
+    [(0.3, 0.9), (0.4, 1.2), (0, 0),      (0, 0)],       # CHAT:     router, chat workflow
+]
+SPAN_TOKENS = [
+    [(30, 120, 1, 5), (150, 400, 20, 60), (0, 0, 0, 0), (200, 500, 40, 150)],
+    [(30, 120, 1, 5), (100, 300, 10, 40), (0, 0, 0, 0), (250, 600, 50, 200)],
+    [(30, 120, 1, 5), (50, 150, 20, 80),  (0, 0, 0, 0), (0, 0, 0, 0)],
+]
 
-def helpfulness_score():
-    return random.choices([1.0, 0.75, 0.5, 0.25, 0.0], weights=[45, 30, 15, 7, 3])[0]
+def turn_route(route, turn, follow_count):
+    # Follow-ups are conversational — route them through CHAT workflow unless
+    # the thread is DATABASE/POLICY and it's the first (content) follow-up
+    return route if turn == 0 or (turn == 1 and follow_count >= 1) else CHAT
 
-def classification_score():
-    return 1.0 if random.random() < 0.88 else 0.0
+# ──────────────────────────────────────────────────────────────────────────────
+# HELPERS
+# ──────────────────────────────────────────────────────────────────────────────
+def make_usage(draws, slot):
+    p, c = draws.prompt_tokens[slot], draws.completion_tokens[slot]
+    return {"prompt_tokens": p, "completion_tokens": c, "total_tokens": p + c}
 
-def frustration_score(turn_scores):
-    base = random.choices([0.0, 0.1, 0.3, 0.6, 0.9, 1.0], weights=[35, 25, 20, 10, 7, 3])[0]
+def frustration_score(base, turn_scores):
     avg_helpfulness = sum(turn_scores) / len(turn_scores) if turn_scores else 1.0
     if avg_helpfulness < 0.4:
         base = min(1.0, base + 0.3)
     return round(base, 2)
 
+def make_id(high, low, timestamp):
+    # Same value as id_helpers.uuid4_to_uuid7(timestamp, str(uuid.UUID(int=high << 64 | low, version=4))),
+    # composed directly from the two random 64-bit halves: the millisecond timestamp,
+    # version 7, 12 bits of `high`, the variant, then 62 bits of `low`
+    value = ((int(timestamp.timestamp() * 1000) << 80) | (0x7 << 76) | ((high & 0xFFF) << 64)
+             | (0b10 << 62) | (low & 0x3FFFFFFFFFFFFFFF))
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+# ──────────────────────────────────────────────────────────────────────────────
+# PAYLOAD DEDUPLICATION
+# The graph definition is identical on every trace, so in local storage only
+# some traces need to carry it (GRAPH_MODE) and the rest can name it by GRAPH_REF,
+# a hash of its content. Opik doesn't know GRAPH_REF, so replay expands it.
+# StringTable interns fixed text blocks for the local sink: records store
+# {"$ref": n} in place of strings[n]. Both report the JSON bytes they save.
+# ──────────────────────────────────────────────────────────────────────────────
+GRAPH_REF          = "mermaid-" + hashlib.sha256(MERMAID_GRAPH.encode()).hexdigest()[:16]
+GRAPH_METADATA     = {"_opik_graph_definition": {"format": "mermaid", "data": MERMAID_GRAPH}}
+GRAPH_REF_METADATA = {"graph_definition_ref": GRAPH_REF}
+GRAPH_BYTES_SAVED  = len(json.dumps(GRAPH_METADATA)) - len(json.dumps(GRAPH_REF_METADATA))
+
+def graph_bytes_saved(trace):
+    return GRAPH_BYTES_SAVED if trace["metadata"] == GRAPH_REF_METADATA else 0
+
+def static_strings():
+    # Every fixed text block a trace can contain, in a stable order
+    strings = [PROJECT_NAME, MERMAID_GRAPH, POLICY_SYSTEM_PROMPT, CHAT_SYSTEM_PROMPT, SQL_RESULT_TABLE, *CLOSING_TURN,
+               f"Classify: {CLOSING_TURN[0]}", "Synthetic user rating"]
+    for turns in ROUTE_TURNS:
+        for d in turns:
+            for question, answer in [(d["question"], d["answer"]), *d.get("follow_ups", [])]:
+                strings += [question, f"Classify: {question}", answer]
+            strings += [d[key] for key in ("sql", "context") if key in d]
+    return list(dict.fromkeys(strings))
+
+class StringTable:
+    def __init__(self, strings):
+        self.strings = strings
+        # string -> ({"$ref": n}, bytes saved per use), for strings longer than their ref
+        self._refs = {}
+        for n, s in enumerate(strings):
+            ref = {"$ref": n}
+            saved = len(json.dumps(s)) - len(json.dumps(ref))
+            if saved > 0:
+                self._refs[s] = (ref, saved)
+
+    def intern(self, value):
+        # (value with every interned string replaced by its ref, bytes saved).
+        # Records are plain JSON-like data, so exact type checks are enough.
+        kind = type(value)
+        if kind is str:
+            return self._refs.get(value) or (value, 0)
+        if kind is dict:
+            out, saved = {}, 0
+            for key, item in value.items():
+                out[key], n = self.intern(item)
+                saved += n
+            return out, saved
+        if kind is list:
+            out, saved = [], 0
+            for item in value:
+                item, n = self.intern(item)
+                out.append(item)
+                saved += n
+            return out, saved
+        return value, 0
+
+    def expand(self, value):
+        if isinstance(value, dict):
+            if len(value) == 1 and "$ref" in value:
+                return self.strings[value["$ref"]]
+            return {key: self.expand(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.expand(item) for item in value]
+        return value
+
+def savings_report(saved, traces, written):
+    # `written` is the deduplicated JSON size, so written + saved is the full payload
+    if not traces:
+        return "no traces"
+    return f"{saved / traces:,.0f} bytes/trace saved by deduplication ({saved / max(1, written + saved):.0%})"
+
 # ──────────────────────────────────────────────────────────────────────────────
 # TRACE BUILDER
 # question and answer are always selected together from the same turn dict
-# so they are guaranteed to match. Returns (question, answer) so the main
-# loop can build realistic chat_history for the next turn.
+# so they are guaranteed to match. Nothing here is random: every duration,
+# token count, score and ID bit comes from the trace's TraceDraws. Each trace
+# is built as a plain record (root trace, spans, feedback scores) and handed
+# to the batcher, so no call here touches the network.
 # ──────────────────────────────────────────────────────────────────────────────
-def log_trace(thread_id, turn_index, question, answer, route, chat_history, trace_start, sql=None, context=None):
-    total_dur = random.uniform(1.2, 9.0)
-    t         = trace_start
-    
+# One trace's draws. span_seconds and the token counts are per span slot, the
+# random ID halves per ID (the trace's own, then one per slot); route is the
+# one they were drawn for.
+TraceDraws = collections.namedtuple("TraceDraws", "route gap seconds span_seconds prompt_tokens completion_tokens "
+                                                  "n_results helpfulness turn_score ids_high ids_low")
+
+def span_record(trace_id, span_id, name, span_type, start, duration, input, output, usage=None):
+    record = {
+        "id":           span_id,
+        "project_name": PROJECT_NAME,
+        "trace_id":     trace_id,
+        "name":         name,
+        "type":         span_type,
+        "input":        input,
+        "output":       output,
+        "start_time":   start,
+        "end_time":     start + timedelta(seconds=duration),
+    }
+    if span_type == "llm":
+        record.update(model=MODEL, provider="openai", usage=usage)
+    return record
+
+def log_trace(sink, draws, thread_id, turn_index, question, answer, trace_start, sql=None, context=None, with_graph=True):
+    route, durations = ROUTES[draws.route], draws.span_seconds
+
     # Ensure timestamp is timezone-aware for proper Opik dashboard grouping
-    if t.tzinfo is None:
-        t = t.replace(tzinfo=timezone.utc)
-    
-    # Generate trace ID with historical timestamp - CRITICAL for dashboard date grouping
-    trace_id = id_helpers.generate_id(timestamp=t)
+    if trace_start.tzinfo is None:
+        trace_start = trace_start.replace(tzinfo=timezone.utc)
+    # Span starts, each where the previous one ends
+    starts = [trace_start]
+    for d in durations[:-1]:
+        starts.append(starts[-1] + timedelta(seconds=d))
 
-    # ── Root trace ─────────────────────────────────────────────────────────
-    trace = client.trace(
-        id           = trace_id,  # Use generated ID with historical timestamp
-        name         = "OhmBot_Support",
-        project_name = PROJECT_NAME,
-        input        = {"user": question},
-        output       = None,
-        tags         = ["production", route.lower()],
-        metadata     = {
-            # Only keep essential metadata - removed redundant fields to reduce payload size
-            "_opik_graph_definition": {"format": "mermaid", "data": MERMAID_GRAPH},
-        },
-        thread_id    = thread_id,
-        start_time   = t,
-    )
+    # Trace and span IDs carry the historical timestamp - CRITICAL for dashboard date grouping
+    ids      = [make_id(high, low, start) for high, low, start in zip(draws.ids_high, draws.ids_low, [trace_start, *starts])]
+    trace_id, span_ids = ids[0], ids[1:]
+    spans    = []
 
     # ── Router span ────────────────────────────────────────────────────────
-    router_dur  = random.uniform(0.3, 0.9)
-    router_span_start = t
-    router_span_id = id_helpers.generate_id(timestamp=router_span_start)
-    router_span = trace.span(
-        id         = router_span_id,  # Use generated ID with historical timestamp
-        name       = "route_user_request",
-        type       = "llm",
-        model      = MODEL,
-        provider   = "openai",
-        input      = {"messages": [{"role": "user", "content": f"Classify: {question}"}]},
-        output     = {"choices": [{"message": {"content": route}}]},
-        usage      = make_usage(30, 120, 1, 5),
-        start_time = router_span_start,
-        end_time   = router_span_start + timedelta(seconds=router_dur),
-    )
+    spans.append(span_record(
+        trace_id, span_ids[0], "route_user_request", "llm", starts[0], durations[0],
+        input  = {"messages": [{"role": "user", "content": f"Classify: {question}"}]},
+        output = {"choices": [{"message": {"content": route}}]},
+        usage  = make_usage(draws, 0),
+    ))
     # Skip feedback score on router span to reduce API calls - we log thread-level scores instead
-    router_span.end()
-    t += timedelta(seconds=router_dur)
 
     # ── Workflow branches ──────────────────────────────────────────────────
     if route == "DATABASE":
-        sql_gen_dur = random.uniform(0.8, 2.5)
-        sql_gen_start = t
-        sql_gen_id = id_helpers.generate_id(timestamp=sql_gen_start)
-        sql_gen = trace.span(
-            id         = sql_gen_id,
-            name       = "SQL_Generation_Step",
-            type       = "llm", model=MODEL, provider="openai",
-            input      = {"messages": [{"role": "user", "content": question}]},
-            output     = {"tool_call": {"name": "run_sql_query", "arguments": {"query": sql}}},
-            usage      = make_usage(150, 400, 20, 60),
-            start_time = sql_gen_start,
-            end_time   = sql_gen_start + timedelta(seconds=sql_gen_dur),
-        )
-        sql_gen.end()
-        t += timedelta(seconds=sql_gen_dur)
-
-        tool_dur  = random.uniform(0.05, 0.3)
-        tool_span_start = t
-        tool_span_id = id_helpers.generate_id(timestamp=tool_span_start)
-        tool_span = trace.span(
-            id         = tool_span_id,
-            name       = "run_sql_query",
-            type       = "tool",
-            input      = {"query": sql},
-            output     = {"result": "| col1 | col2 |\n|------|------|\n| val1 | val2 |"},
-            start_time = tool_span_start,
-            end_time   = tool_span_start + timedelta(seconds=tool_dur),
-        )
-        tool_span.end()
-        t += timedelta(seconds=tool_dur)
-
-        final_dur  = random.uniform(0.5, 1.5)
-        final_span_start = t
-        final_span_id = id_helpers.generate_id(timestamp=final_span_start)
-        final_span = trace.span(
-            id         = final_span_id,
-            name       = "SQL_Final_Answer_Step",
-            type       = "llm", model=MODEL, provider="openai",
-            input      = {"messages": [{"role": "user", "content": question}]},
-            output     = {"choices": [{"message": {"content": answer}}]},
-            usage      = make_usage(200, 500, 40, 150),
-            start_time = final_span_start,
-            end_time   = final_span_start + timedelta(seconds=final_dur),
-        )
-        final_span.end()
+        spans.append(span_record(
+            trace_id, span_ids[1], "SQL_Generation_Step", "llm", starts[1], durations[1],
+            input  = {"messages": [{"role": "user", "content": question}]},
+            output = {"tool_call": {"name": "run_sql_query", "arguments": {"query": sql}}},
+            usage  = make_usage(draws, 1),
+        ))
+        spans.append(span_record(
+            trace_id, span_ids[2], "run_sql_query", "tool", starts[2], durations[2],
+            input  = {"query": sql},
+            output = {"result": SQL_RESULT_TABLE},
+        ))
+        spans.append(span_record(
+            trace_id, span_ids[3], "SQL_Final_Answer_Step", "llm", starts[3], durations[3],
+            input  = {"messages": [{"role": "user", "content": question}]},
+            output = {"choices": [{"message": {"content": answer}}]},
+            usage  = make_usage(draws, 3),
+        ))
 
     elif route == "POLICY":
-        rag_gen_dur = random.uniform(0.6, 1.8)
-        rag_gen_start = t
-        rag_gen_id = id_helpers.generate_id(timestamp=rag_gen_start)
-        rag_gen = trace.span(
-            id         = rag_gen_id,
-            name       = "RAG_Query_Generation",
-            type       = "llm", model=MODEL, provider="openai",
-            input      = {"messages": [{"role": "user", "content": question}]},
-            output     = {"tool_call": {"name": "look_up_policy", "arguments": {"query": question}}},
-            usage      = make_usage(100, 300, 10, 40),
-            start_time = rag_gen_start,
-            end_time   = rag_gen_start + timedelta(seconds=rag_gen_dur),
-        )
-        rag_gen.end()
-        t += timedelta(seconds=rag_gen_dur)
-
-        retrieval_dur  = random.uniform(0.1, 0.5)
-        retrieval_span_start = t
-        retrieval_span_id = id_helpers.generate_id(timestamp=retrieval_span_start)
-        retrieval_span = trace.span(
-            id         = retrieval_span_id,
-            name       = "look_up_policy",
-            type       = "tool",
-            input      = {"query": question},
-            output     = {"chunks": [context], "n_results": random.randint(1, 3)},
-            start_time = retrieval_span_start,
-            end_time   = retrieval_span_start + timedelta(seconds=retrieval_dur),
-        )
-        retrieval_span.end()
-        t += timedelta(seconds=retrieval_dur)
-
-        final_dur  = random.uniform(0.6, 2.0)
-        final_span_start = t
-        final_span_id = id_helpers.generate_id(timestamp=final_span_start)
-        final_span = trace.span(
-            id         = final_span_id,
-            name       = "RAG_Final_Answer_Step",
-            type       = "llm", model=MODEL, provider="openai",
-            input      = {"messages": [
-                {"role": "system", "content": "You are a policy assistant. Use the handbook."},
+        spans.append(span_record(
+            trace_id, span_ids[1], "RAG_Query_Generation", "llm", starts[1], durations[1],
+            input  = {"messages": [{"role": "user", "content": question}]},
+            output = {"tool_call": {"name": "look_up_policy", "arguments": {"query": question}}},
+            usage  = make_usage(draws, 1),
+        ))
+        spans.append(span_record(
+            trace_id, span_ids[2], "look_up_policy", "tool", starts[2], durations[2],
+            input  = {"query": question},
+            output = {"chunks": [context], "n_results": draws.n_results},
+        ))
+        spans.append(span_record(
+            trace_id, span_ids[3], "RAG_Final_Answer_Step", "llm", starts[3], durations[3],
+            input  = {"messages": [
+                {"role": "system", "content": POLICY_SYSTEM_PROMPT},
                 {"role": "tool",   "content": context},
                 {"role": "user",   "content": question},
             ]},
-            output     = {"choices": [{"message": {"content": answer}}]},
-            usage      = make_usage(250, 600, 50, 200),
-            start_time = final_span_start,
-            end_time   = final_span_start + timedelta(seconds=final_dur),
-        )
-        final_span.end()
+            output = {"choices": [{"message": {"content": answer}}]},
+            usage  = make_usage(draws, 3),
+        ))
 
     else:  # CHAT
-        chat_dur  = random.uniform(0.4, 1.2)
-        chat_span_start = t
-        chat_span_id = id_helpers.generate_id(timestamp=chat_span_start)
-        chat_span = trace.span(
-            id         = chat_span_id,
-            name       = "run_chat_workflow",
-            type       = "llm", model=MODEL, provider="openai",
-            input      = {"messages": [
-                {"role": "system", "content": "You are a helpful customer support assistant."},
+        spans.append(span_record(
+            trace_id, span_ids[1], "run_chat_workflow", "llm", starts[1], durations[1],
+            input  = {"messages": [
+                {"role": "system", "content": CHAT_SYSTEM_PROMPT},
                 {"role": "user",   "content": question},
             ]},
-            output     = {"choices": [{"message": {"content": answer}}]},
-            usage      = make_usage(50, 150, 20, 80),
-            start_time = chat_span_start,
-            end_time   = chat_span_start + timedelta(seconds=chat_dur),
-        )
-        chat_span.end()
-
-    # ── Close root trace ───────────────────────────────────────────────────
-    # Ensure end_time is also timezone-aware
-    trace_end = trace_start + timedelta(seconds=total_dur)
-    if trace_end.tzinfo is None:
-        trace_end = trace_end.replace(tzinfo=timezone.utc)
-    
-    trace.end(
-        end_time = trace_end,
-        output   = {"assistant": answer},
-    )
-    trace.log_feedback_score(
-        name   = "answer_helpfulness",
-        value  = helpfulness_score(),
-        reason = "Synthetic user rating",
-    )
+            output = {"choices": [{"message": {"content": answer}}]},
+            usage  = make_usage(draws, 1),
+        ))
 
+    # ── Root trace ─────────────────────────────────────────────────────────
+    trace = {
+        "id":           trace_id,  # Use generated ID with historical timestamp
+        "name":         "OhmBot_Support",
+        "project_name": PROJECT_NAME,
+        "input":        {"user": question},
+        "output":       {"assistant": answer},
+        "tags":         ["production", route.lower()],
+        # Only keep essential metadata - removed redundant fields to reduce payload size
+        "metadata":     GRAPH_METADATA if with_graph else GRAPH_REF_METADATA,
+        "thread_id":    thread_id,
+        "start_time":   trace_start,
+        "end_time":     trace_start + timedelta(seconds=draws.seconds),
+    }
+    scores = [{
+        "id":           trace_id,
+        "project_name": PROJECT_NAME,
+        "name":         "answer_helpfulness",
+        "value":        draws.helpfulness,
+        "reason":       "Synthetic user rating",
+    }]
+    sink.add(trace, spans, scores)
+    return len(spans)
 
 # ──────────────────────────────────────────────────────────────────────────────
-# MAIN LOOP
-# Each thread picks one turn dict (first turn) then uses that dict's follow_ups
-# for subsequent turns — so every conversation stays on topic.
+# SINKS
+# Where finished records go. Every sink has the same interface:
+#   add(trace, spans, scores)   one trace with its spans and trace-level scores
+#   add_thread_score(score)     a thread-level score, given after all of that thread's traces
+#   flush()                     make everything added so far durable; returns the
+#                               state a resumed run needs (saved in the checkpoint)
+#   close()                     final flush; returns the same state
+#   summary()                   one-line report for the final print
+# OpikSink batches into the backend's bulk endpoints; LocalSink writes gzip
+# JSONL files that `python seed_data.py replay DIR` uploads later.
 # ──────────────────────────────────────────────────────────────────────────────
-now = datetime.now(timezone.utc)
-total_traces = 0
-
-for thread_idx in tqdm(range(NUM_THREADS), desc="Seeding OhmBot traces", unit="thread"):
-    thread_id    = f"session-{uuid.uuid4().hex[:12]}"
-    # Weights adjusted to average ~3 traces per thread: [5, 20, 50, 25] for [1, 2, 3, 4] turns
-    # Expected value: 1*0.05 + 2*0.20 + 3*0.50 + 4*0.25 = 2.95 ≈ 3 traces per thread
-    num_turns    = random.choices([1, 2, 3, 4], weights=[5, 20, 50, 25])[0]
-    days_ago     = random.betavariate(2, 5) * DAYS_BACK
-    # Calculate historical timestamp - ensure it's timezone-aware
-    thread_start = now - timedelta(days=days_ago, minutes=random.randint(0, 120))
-    if thread_start.tzinfo is None:
-        thread_start = thread_start.replace(tzinfo=timezone.utc)
-
-    # Pick route and a matching turn dict for this whole thread
-    route = random.choices(["DATABASE", "POLICY", "CHAT"], weights=ROUTE_WEIGHTS)[0]
-    if route == "DATABASE":
-        turn_dict = random.choice(DATABASE_TURNS)
-    elif route == "POLICY":
-        turn_dict = random.choice(POLICY_TURNS)
+def json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def record_bytes(record):
+    return len(json.dumps(record, default=json_default))
+
+def retryable(error):
+    # Malformed or unauthorised requests fail the same way every time; anything
+    # else (timeouts, 5xx, 429, a thread the backend hasn't registered yet) may pass later
+    return getattr(error, "status_code", None) not in (400, 401, 403, 422)
+
+def backoff_delay(attempt, backoff=RETRY_BACKOFF):
+    # Seconds to wait after failed attempt number `attempt` (from 1)
+    return min(RETRY_BACKOFF_MAX, backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+class ThreadScoreQueue:
+    # Deferred user_frustration scoring. OpikSink queues each batch of thread
+    # scores together with its batch number; a background thread waits until
+    # every earlier batch (so every trace of those threads) is sent, closes the
+    # threads so the backend accepts scores now rather than after 15 minutes of
+    # inactivity, and scores them in one bulk call. A failed batch is retried
+    # with jittered exponential backoff and dropped after SCORE_MAX_ATTEMPTS.
+    # Anything else that goes wrong in the worker (no client, a malformed score)
+    # is kept and re-raised by join(), so the worker never dies with batches queued.
+    def __init__(self, wait_sent, max_attempts=SCORE_MAX_ATTEMPTS, backoff=RETRY_BACKOFF):
+        self.max_attempts = max_attempts
+        self.backoff      = backoff
+        self.submitted    = 0
+        self.retried      = 0
+        self.dropped      = 0
+        self.requests     = 0
+        self.last_error   = None
+        self._failure     = None
+        self._wait_sent   = wait_sent
+        self._queue       = queue.Queue()
+        threading.Thread(target=self._run, name="thread-scores", daemon=True).start()
+
+    def put(self, number, scores):
+        self._queue.put((number, scores))
+
+    def join(self):
+        # Returns once every queued batch is submitted or dropped
+        self._queue.join()
+        if self._failure is not None:
+            raise RuntimeError(f"thread score submission failed: {self.last_error}") from self._failure
+
+    def _run(self):
+        while True:
+            number, scores = self._queue.get()
+            try:
+                self._wait_sent(number - 1)
+                self._submit(scores)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.dropped   += len(scores)
+                self._failure   = self._failure or e
+            finally:
+                self._queue.task_done()
+
+    def _submit(self, scores):
+        from opik.rest_api.types import FeedbackScoreBatchItemThread
+        rest = get_client().rest_client
+        thread_ids = list(dict.fromkeys(s["id"] for s in scores))
+        items = [FeedbackScoreBatchItemThread(thread_id=s["id"], project_name=PROJECT_NAME, name=s["name"],
+                                              value=s["value"], reason=s["reason"], source="sdk") for s in scores]
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.requests += 2
+                rest.traces.close_trace_thread(project_name=PROJECT_NAME, thread_ids=thread_ids)
+                rest.traces.score_batch_of_threads(scores=items)
+                self.submitted += len(scores)
+                return
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                if attempt == self.max_attempts or not retryable(e):
+                    self.dropped += len(scores)
+                    return
+                self.retried += len(scores)
+                time.sleep(backoff_delay(attempt, self.backoff))
+
+    def summary(self):
+        report = f"thread scores: {self.submitted:,} submitted, {self.retried:,} retried, {self.dropped:,} dropped"
+        if self.dropped:
+            report += f" (last error: {self.last_error})"
+        return report
+
+class OpikSink:
+    # Records are buffered and sent through the REST bulk endpoints, so the request
+    # count is about (traces + spans) / BATCH_MAX_ITEMS rather than several per trace.
+    # Trace and score buffers flush together (traces first), so a score never
+    # reaches the backend ahead of its trace. Batches are numbered as they are
+    # taken; a batch of thread scores waits until every earlier batch has been
+    # sent, so thread scores never overtake their threads either, and flush()
+    # waits the same way for everything taken before it. Thread scores go out
+    # through a ThreadScoreQueue, off the workers' critical path. Trace and span
+    # requests are retried like thread scores, but one that keeps failing raises:
+    # dropping it would leave the checkpoint counting traces that never arrived.
+    def __init__(self, max_items=BATCH_MAX_ITEMS, max_bytes=BATCH_MAX_BYTES, max_attempts=SEND_MAX_ATTEMPTS):
+        self.max_items    = max_items
+        self.max_bytes    = max_bytes
+        self.max_attempts = max_attempts
+        self.requests     = 0
+        self.retried      = 0
+        self.sent_bytes   = 0
+        self.traces       = 0
+        self.saved        = 0
+        self._lock        = threading.Lock()
+        self._sent        = threading.Condition(self._lock)
+        self._traces, self._scores, self._trace_bytes = [], [], 0
+        self._spans, self._span_bytes = [], 0
+        self._thread_scores = []
+        self._taken      = 0       # batches taken so far, numbered from 1
+        self._sent_upto  = 0       # every batch up to this number is sent
+        self._sent_early = set()   # sent batches numbered above _sent_upto
+        self.thread_scores = ThreadScoreQueue(self._wait_sent)
+
+    def _full(self, pending, pending_bytes, size):
+        return bool(pending) and (len(pending) >= self.max_items or pending_bytes + size > self.max_bytes)
+
+    # Batches are (number, kind, records, trace scores, bytes)
+    def _take_traces(self):
+        self._taken += 1
+        batch = (self._taken, "traces", self._traces, self._scores, self._trace_bytes)
+        self._traces, self._scores, self._trace_bytes = [], [], 0
+        return batch
+
+    def _take_spans(self):
+        self._taken += 1
+        batch = (self._taken, "spans", self._spans, None, self._span_bytes)
+        self._spans, self._span_bytes = [], 0
+        return batch
+
+    def _take_thread_scores(self):
+        # Still-buffered traces may belong to these threads, so they go out first
+        batches = [self._take_traces()] if self._traces else []
+        self._taken += 1
+        batches.append((self._taken, "thread_scores", self._thread_scores, None, 0))
+        self._thread_scores = []
+        return batches
+
+    def add(self, trace, spans, scores):
+        trace_size = record_bytes(trace) + sum(record_bytes(s) for s in scores)
+        span_sizes = [record_bytes(s) for s in spans]
+        ready = []  # full batches, sent once the lock is released so other workers keep going
+        with self._lock:
+            if self._full(self._traces, self._trace_bytes, trace_size):
+                ready.append(self._take_traces())
+            self._traces.append(trace)
+            self._scores.extend(scores)
+            self._trace_bytes += trace_size
+            self.traces += 1
+            self.saved  += graph_bytes_saved(trace)
+            for span, size in zip(spans, span_sizes):
+                if self._full(self._spans, self._span_bytes, size):
+                    ready.append(self._take_spans())
+                self._spans.append(span)
+                self._span_bytes += size
+        self._send_all(ready)
+
+    def add_thread_score(self, score):
+        with self._lock:
+            self._thread_scores.append(score)
+            ready = self._take_thread_scores() if len(self._thread_scores) >= self.max_items else []
+        self._send_all(ready)
+
+    def _mark_sent(self, number):
+        with self._lock:
+            if number > self._sent_upto:
+                self._sent_early.add(number)
+            while self._sent_upto + 1 in self._sent_early:
+                self._sent_upto += 1
+                self._sent_early.remove(self._sent_upto)
+            self._sent.notify_all()
+
+    def _wait_sent(self, number):
+        with self._sent:
+            self._sent.wait_for(lambda: self._sent_upto >= number)
+
+    def _send_all(self, batches):
+        try:
+            for batch in batches:
+                self._send(*batch)
+                self._mark_sent(batch[0])
+        finally:
+            # A failed send must not leave anyone waiting forever on its batches
+            for batch in batches:
+                self._mark_sent(batch[0])
+
+    def _request(self, call, **kwargs):
+        # One bulk request, retried with backoff; the last error propagates
+        for attempt in range(1, self.max_attempts + 1):
+            with self._lock:
+                self.requests += 1
+            try:
+                return call(**kwargs)
+            except Exception as e:
+                if attempt == self.max_attempts or not retryable(e):
+                    raise
+                with self._lock:
+                    self.retried += 1
+                time.sleep(backoff_delay(attempt))
+
+    def _send(self, number, kind, records, scores, size):
+        from opik.rest_api.types import FeedbackScoreBatchItem, SpanWrite, TraceWrite
+        rest = get_client().rest_client
+        if kind == "traces":
+            self._request(rest.traces.create_traces, traces=[TraceWrite(**r) for r in records])
+            # One score per trace, so the score batch is within the same limits
+            self._request(rest.traces.score_batch_of_traces,
+                          scores=[FeedbackScoreBatchItem(source="sdk", **s) for s in scores])
+        elif kind == "spans":
+            self._request(rest.spans.create_spans, spans=[SpanWrite(**r) for r in records])
+        else:
+            # Counts as sent once queued: only flush() needs it actually submitted
+            self.thread_scores.put(number, records)
+        with self._lock:
+            self.sent_bytes += size
+
+    def flush(self):
+        with self._lock:
+            ready = [self._take_traces()] if self._traces else []
+            if self._spans:
+                ready.append(self._take_spans())
+            if self._thread_scores:
+                ready += self._take_thread_scores()
+            upto = self._taken
+        self._send_all(ready)
+        # Batches other workers took earlier may still be on the wire
+        self._wait_sent(upto)
+        self.thread_scores.join()
+        return {}
+
+    def close(self):
+        return self.flush()
+
+    def summary(self):
+        return (f"{self.requests + self.thread_scores.requests} bulk requests ({self.sent_bytes / 1e6:,.1f} MB, "
+                f"{self.retried:,} retried), "
+                f"{savings_report(self.saved, self.traces, self.sent_bytes)}, {self.thread_scores.summary()}")
+
+class LocalSink:
+    # One JSON line per trace ({"trace", "spans", "scores"}) in traces.jsonl.gz and
+    # one per thread score in thread_scores.jsonl.gz, timestamps as ISO strings.
+    # Trace lines refer to the static text in strings.json (see StringTable).
+    # Nothing touches the network, so generation can be profiled on its own.
+    # Each flush() ends a gzip member (gzip readers concatenate members) and
+    # returns the byte offsets; resuming truncates back to them, which drops
+    # whatever a crashed run wrote after its last checkpoint.
+    FILES   = ("traces.jsonl.gz", "thread_scores.jsonl.gz")
+    STRINGS = "strings.json"
+
+    def __init__(self, directory=SINK_DIR, resume=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.records   = 0
+        self.traces    = 0
+        self.written   = 0
+        self.saved     = 0
+        self._lock     = threading.Lock()
+        self._files    = {}
+        # A resumed run keeps the table its earlier records refer to
+        strings_path = os.path.join(directory, self.STRINGS)
+        if resume:
+            with open(strings_path) as f:
+                self.strings = StringTable(json.load(f))
+        else:
+            self.strings = StringTable(static_strings())
+            with open(strings_path, "w") as f:
+                json.dump(self.strings.strings, f)
+        for name in self.FILES:
+            raw = open(os.path.join(directory, name), "r+b" if resume else "wb")
+            raw.truncate(resume[name] if resume else 0)
+            raw.seek(0, os.SEEK_END)
+            self._files[name] = [raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)]
+
+    def _write(self, name, line):
+        self._files[name][1].write(line.encode() + b"\n")
+
+    def add(self, trace, spans, scores):
+        bundle, saved = self.strings.intern({"trace": trace, "spans": spans, "scores": scores})
+        line = json.dumps(bundle, default=json_default)
+        with self._lock:
+            self._write("traces.jsonl.gz", line)
+            self.records += 1 + len(spans) + len(scores)
+            self.traces  += 1
+            self.written += len(line)
+            self.saved   += saved + graph_bytes_saved(trace)
+
+    def add_thread_score(self, score):
+        line = json.dumps(score)
+        with self._lock:
+            self._write("thread_scores.jsonl.gz", line)
+            self.records += 1
+
+    def flush(self, reopen=True):
+        offsets = {}
+        with self._lock:
+            for name, (raw, member) in self._files.items():
+                member.close()  # writes the member trailer; leaves `raw` open
+                raw.flush()
+                os.fsync(raw.fileno())
+                offsets[name] = raw.tell()
+                if reopen:
+                    self._files[name][1] = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+        return {"files": offsets}
+
+    def close(self):
+        state = self.flush(reopen=False)
+        for raw, _ in self._files.values():
+            raw.close()
+        return state
+
+    def summary(self):
+        size = sum(os.path.getsize(os.path.join(self.directory, name)) for name in (*self.FILES, self.STRINGS))
+        return (f"{self.records:,} records written to {self.directory} ({size / 1e6:,.1f} MB compressed), "
+                f"{savings_report(self.saved, self.traces, self.written)}")
+
+def read_jsonl(path):
+    with gzip.open(path, "rt") as f:
+        for line in f:
+            yield json.loads(line)
+
+def replay(directory):
+    # Uploads a LocalSink directory through the bulk path into PROJECT_NAME.
+    # Streams the file, so memory stays flat whatever its size.
+    sink = OpikSink(max_items=BATCH_MAX_ITEMS)
+    traces = 0
+    strings_path = os.path.join(directory, LocalSink.STRINGS)
+    strings = None
+    if os.path.exists(strings_path):
+        with open(strings_path) as f:
+            strings = StringTable(json.load(f))
+    for bundle in tqdm(read_jsonl(os.path.join(directory, "traces.jsonl.gz")), desc="Replaying traces", unit="trace"):
+        if strings:
+            bundle = strings.expand(bundle)
+        if bundle["trace"].get("metadata") == GRAPH_REF_METADATA:
+            bundle["trace"]["metadata"] = GRAPH_METADATA
+        for record in [bundle["trace"], *bundle["spans"], *bundle["scores"]]:
+            record["project_name"] = PROJECT_NAME
+        sink.add(bundle["trace"], bundle["spans"], bundle["scores"])
+        traces += 1
+    thread_scores_path = os.path.join(directory, "thread_scores.jsonl.gz")
+    if os.path.exists(thread_scores_path):
+        for score in read_jsonl(thread_scores_path):
+            sink.add_thread_score(score)
+    sink.close()
+    print(f"✅ Replayed {traces} traces from {directory} into '{PROJECT_NAME}': {sink.summary()}")
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ARRIVAL TIMES
+# "beta" is the original model: threads skewed towards recent days. "diurnal"
+# spreads threads evenly over DAYS_BACK days but shapes them with hour-of-day
+# and day-of-week traffic curves (UTC), like production load.
+# ──────────────────────────────────────────────────────────────────────────────
+HOURLY_WEIGHTS  = [0.15, 0.10, 0.08, 0.07, 0.08, 0.12, 0.25, 0.45, 0.70, 0.90, 1.00, 1.00,
+                   0.95, 0.95, 0.95, 0.90, 0.85, 0.85, 0.90, 0.95, 0.85, 0.65, 0.45, 0.25]
+WEEKDAY_WEIGHTS = [1.00, 1.00, 0.95, 0.95, 0.90, 0.70, 0.60]   # Monday first
+
+def arrival_curve(now, days_back):
+    # (first hour, cumulative weight of every hour in the window, oldest first)
+    first = (now - timedelta(days=days_back)).replace(minute=0, second=0, microsecond=0)
+    hours = (first + timedelta(hours=i) for i in range(int(days_back * 24)))
+    return first, list(itertools.accumulate(WEEKDAY_WEIGHTS[h.weekday()] * HOURLY_WEIGHTS[h.hour] for h in hours))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# SAMPLERS
+# Threads are drawn PLAN_CHUNK at a time from one generator per chunk, seeded
+# with (MASTER_SEED, chunk index). With numpy, each quantity is drawn for the
+# whole chunk as one column (route choices, durations, token usages, scores,
+# ID bits...); without it, the pure-Python sampler draws the same columns one
+# value at a time. Each is reproducible on its own, but the two produce
+# different streams. The NumPy sampler draws per-trace columns for all
+# MAX_TURNS turns of every thread, and a thread just uses as many as it has.
+# Both return {"origin": datetime, "threads": [(thread bits, turns, start
+# offset in seconds from origin, route, turn dict index, follow-up order,
+# frustration base, [TraceDraws per turn]), ...]}.
+# ──────────────────────────────────────────────────────────────────────────────
+def probabilities(weights):
+    import numpy as np
+    return np.divide(weights, sum(weights))
+
+def follow_counts():
+    # [route][turn dict] -> number of follow-ups, padded to a rectangle
+    import numpy as np
+    width = max(len(turns) for turns in ROUTE_TURNS)
+    return np.array([[len(d.get("follow_ups", [])) for d in turns] + [0] * (width - len(turns))
+                     for turns in ROUTE_TURNS])
+
+def sample_chunk_numpy(chunk_idx, now, curve):
+    import numpy as np
+    g     = np.random.default_rng([MASTER_SEED, chunk_idx])
+    n     = PLAN_CHUNK
+    shape = (n, MAX_TURNS)
+
+    thread_bits = g.integers(0, 1 << 48, n)
+    num_turns   = g.choice(TURN_COUNTS, n, p=probabilities(TURN_WEIGHTS))
+    if curve is None:
+        origin = now
+        offset = -(g.beta(2, 5, n) * DAYS_BACK * 86400 + g.integers(0, 121, n) * 60)
     else:
-        turn_dict = random.choice(CHAT_TURNS)
+        origin, cumulative = curve
+        hour   = np.searchsorted(cumulative, g.random(n) * cumulative[-1], side="right")
+        offset = hour * 3600 + g.uniform(0, 3600, n)
+    route       = g.choice(len(ROUTES), n, p=probabilities(ROUTE_WEIGHTS))
+    dict_idx    = (g.random(n) * np.array([len(t) for t in ROUTE_TURNS])[route]).astype(np.int64)
+    n_follow    = follow_counts()[route, dict_idx]
+    # A random permutation of each thread's follow-ups: sort random keys, with
+    # the padding past n_follow keyed to sort last
+    keys        = g.random((n, MAX_FOLLOW_UPS))
+    keys[np.arange(MAX_FOLLOW_UPS) >= n_follow[:, None]] = 2.0
+    follow_ups  = np.argsort(keys, axis=1)
+    frustration = g.choice(FRUSTRATION_SCORES, n, p=probabilities(FRUSTRATION_WEIGHTS))
 
-    # Shuffle follow-ups so repeated threads with same dict feel different
-    follow_ups = list(turn_dict.get("follow_ups", []))
-    random.shuffle(follow_ups)
+    # Per trace: the turn's route (turn_route(), vectorised) picks its span ranges
+    turn        = np.arange(MAX_TURNS)
+    routes      = np.where((turn == 0) | ((turn == 1) & (n_follow[:, None] >= 1)), route[:, None], CHAT)
+    seconds     = np.array(SPAN_SECONDS, dtype=float)[routes]      # (n, turns, spans, 2)
+    tokens      = np.array(SPAN_TOKENS)[routes]                    # (n, turns, spans, 4)
+    columns = [  # in TraceDraws field order
+        routes,
+        g.uniform(*TURN_GAP_MINUTES, shape),
+        g.uniform(*TRACE_SECONDS, shape),
+        g.uniform(seconds[..., 0], seconds[..., 1]),
+        g.integers(tokens[..., 0], tokens[..., 1] + 1),
+        g.integers(tokens[..., 2], tokens[..., 3] + 1),
+        g.integers(N_RESULTS[0], N_RESULTS[1] + 1, shape),
+        g.choice(HELPFULNESS_SCORES, shape, p=probabilities(HELPFULNESS_WEIGHTS)),
+        g.choice(HELPFULNESS_SCORES, shape, p=probabilities(HELPFULNESS_WEIGHTS)),
+        g.integers(0, 1 << 64, (n, MAX_TURNS, MAX_SPANS + 1), dtype=np.uint64),
+        g.integers(0, 1 << 64, (n, MAX_TURNS, MAX_SPANS + 1), dtype=np.uint64),
+    ]
 
-    chat_history = []
-    turn_scores  = []
+    # Python scalars from here on, since assembly indexes them one at a time
+    # (slow on numpy scalars); TraceDraws only for the turns a thread has
+    num_turns = num_turns.tolist()
+    traces = [[TraceDraws._make(turn) for turn in itertools.islice(zip(*thread), turns)]
+              for turns, *thread in zip(num_turns, *(c.tolist() for c in columns))]
+    threads = zip(thread_bits.tolist(), num_turns, offset.tolist(), route.tolist(), dict_idx.tolist(),
+                  follow_ups.tolist(), frustration.tolist(), traces)
+    return {"origin": origin, "threads": list(threads)}
 
-    for turn in range(num_turns):
-        turn_start = thread_start + timedelta(minutes=turn * random.uniform(2, 8))
+def sample_chunk_python(chunk_idx, now, curve):
+    rng     = random.Random(f"{MASTER_SEED}:{chunk_idx}")
+    threads = []
+    for _ in range(PLAN_CHUNK):
+        thread_bits = rng.getrandbits(48)
+        num_turns   = rng.choices(TURN_COUNTS, weights=TURN_WEIGHTS)[0]
+        if curve is None:
+            offset = -(rng.betavariate(2, 5) * DAYS_BACK * 86400 + rng.randint(0, 120) * 60)
+        else:
+            cumulative = curve[1]
+            offset = bisect.bisect_right(cumulative, rng.random() * cumulative[-1]) * 3600 + rng.uniform(0, 3600)
+        route       = rng.choices(range(len(ROUTES)), weights=ROUTE_WEIGHTS)[0]
+        dict_idx    = rng.randrange(len(ROUTE_TURNS[route]))
+        follow_ups  = list(range(len(ROUTE_TURNS[route][dict_idx].get("follow_ups", []))))
+        rng.shuffle(follow_ups)
+        frustration = rng.choices(FRUSTRATION_SCORES, weights=FRUSTRATION_WEIGHTS)[0]
+        traces = []
+        for turn in range(num_turns):
+            r = turn_route(route, turn, len(follow_ups))
+            traces.append(TraceDraws(
+                route             = r,
+                gap               = rng.uniform(*TURN_GAP_MINUTES),
+                seconds           = rng.uniform(*TRACE_SECONDS),
+                span_seconds      = [rng.uniform(lo, hi) for lo, hi in SPAN_SECONDS[r]],
+                prompt_tokens     = [rng.randint(lo, hi) for lo, hi, _, _ in SPAN_TOKENS[r]],
+                completion_tokens = [rng.randint(lo, hi) for _, _, lo, hi in SPAN_TOKENS[r]],
+                n_results         = rng.randint(*N_RESULTS),
+                helpfulness       = rng.choices(HELPFULNESS_SCORES, weights=HELPFULNESS_WEIGHTS)[0],
+                turn_score        = rng.choices(HELPFULNESS_SCORES, weights=HELPFULNESS_WEIGHTS)[0],
+                ids_high          = [rng.getrandbits(64) for _ in range(MAX_SPANS + 1)],
+                ids_low           = [rng.getrandbits(64) for _ in range(MAX_SPANS + 1)],
+            ))
+        threads.append((thread_bits, num_turns, offset, route, dict_idx, follow_ups, frustration, traces))
+    return {"origin": now if curve is None else curve[0], "threads": threads}
+
+def chunk_sampler():
+    # The sampler SAMPLER names. Importing numpy here rather than in the first
+    # chunk lets main() load it before gc.freeze().
+    if SAMPLER == "numpy":
+        import numpy  # noqa: F401
+        return sample_chunk_numpy
+    return sample_chunk_python
+
+# ──────────────────────────────────────────────────────────────────────────────
+# THREAD SEEDER
+# Each thread picks one turn dict (first turn) then uses that dict's follow_ups
+# for subsequent turns — so every conversation stays on topic. A thread's draws
+# depend only on its index (its chunk and its place in it), so the data is
+# identical whichever worker runs it and however many workers there are.
+# ──────────────────────────────────────────────────────────────────────────────
+def thread_plans(now, start_thread=0, planned=0, sample_chunk=None):
+    # Lazily yields plans until NUM_THREADS threads, or exactly TARGET_TRACES traces, are
+    # planned. A resumed run samples `start_thread`'s chunk and starts there (with
+    # `planned` traces already done) without replaying any earlier chunk.
+    sample_chunk = sample_chunk or chunk_sampler()
+    curve = arrival_curve(now, DAYS_BACK) if TIME_MODEL == "diurnal" else None
+    first_chunk, skip = divmod(start_thread, PLAN_CHUNK)
+    for chunk_idx in itertools.count(first_chunk):
+        chunk = sample_chunk(chunk_idx, now, curve)
+        for position, thread in enumerate(chunk["threads"][skip:], skip):
+            thread_bits, num_turns, offset, route, dict_idx, follow_order, frustration, traces = thread
+            if TARGET_TRACES:
+                if planned >= TARGET_TRACES:
+                    return
+                num_turns = min(num_turns, TARGET_TRACES - planned)
+            elif chunk_idx * PLAN_CHUNK + position >= NUM_THREADS:
+                return
+            turn_dict = ROUTE_TURNS[route][dict_idx]
+            follow_ups = turn_dict.get("follow_ups", [])
+            planned += num_turns
+            yield {
+                "thread_idx":   chunk_idx * PLAN_CHUNK + position,
+                "thread_id":    f"session-{thread_bits:012x}",
+                "thread_start": chunk["origin"] + timedelta(seconds=offset),
+                "turn_dict":    turn_dict,
+                "follow_ups":   [follow_ups[i] for i in follow_order[:len(follow_ups)]],
+                "frustration":  frustration,
+                "traces":       traces[:num_turns],
+            }
+        skip = 0
+
+def seed_thread(plan, sink):
+    # Logs one planned conversation thread into `sink`; returns (traces, spans) logged
+    thread_id, thread_start, turn_dict = plan["thread_id"], plan["thread_start"], plan["turn_dict"]
+    follow_ups  = plan["follow_ups"]
+    num_turns   = len(plan["traces"])
+    turn_scores = []
+    spans       = 0
+
+    for turn, draws in enumerate(plan["traces"]):
+        turn_start = thread_start + timedelta(minutes=turn * draws.gap)
 
         if turn == 0:
             # First turn: use the primary question/answer from the turn dict
             question = turn_dict["question"]
             answer   = turn_dict["answer"]
-        elif follow_ups:
+        elif turn <= len(follow_ups):
             # Subsequent turns: use a follow-up from the same topic
-            question, answer = follow_ups.pop(0)
-            # Follow-ups are conversational — route them through CHAT workflow
-            # unless the thread is DATABASE/POLICY and it's a content follow-up
-            route = route if turn == 1 else "CHAT"
+            question, answer = follow_ups[turn - 1]
         else:
             # Ran out of follow-ups — close the thread naturally
-            question = "Thanks, that's all I needed!"
-            answer   = "Happy to help! Don't hesitate to reach out if anything comes up."
-            route    = "CHAT"
+            question, answer = CLOSING_TURN
 
-        log_trace(
+        spans += log_trace(
+            sink         = sink,
+            draws        = draws,
             thread_id    = thread_id,
             turn_index   = turn,
             question     = question,
             answer       = answer,
-            route        = route,
-            chat_history = chat_history,
             trace_start  = turn_start,
             sql          = turn_dict.get("sql"),
             context      = turn_dict.get("context"),
+            with_graph   = GRAPH_MODE == "trace" or (turn == 0 and (GRAPH_MODE == "thread" or plan["thread_idx"] == 0)),
         )
+        turn_scores.append(draws.turn_score)
+
+    # ── Thread-level frustration score; the sink sends it after the thread's traces
+    sink.add_thread_score({
+        "id"    : thread_id,
+        "name"  : "user_frustration",
+        "value" : frustration_score(plan["frustration"], turn_scores),
+        "reason": f"{num_turns} turn(s), avg helpfulness {sum(turn_scores)/len(turn_scores):.2f}",
+    })
+    return num_turns, spans
+
+def run_pipeline(plans, sink, on_drained=None):
+    # Yields (traces, spans) per finished thread. At most MAX_IN_FLIGHT threads are
+    # queued or running, so plans are only drawn as fast as the workers (and the
+    # sink sends they block on) get through them: memory stays flat at any volume.
+    # Every CHECKPOINT_EVERY threads the window drains completely and on_drained()
+    # runs, at a point where every thread submitted so far is finished.
+    with ThreadPoolExecutor(max_workers=NUM_WORKERS, thread_name_prefix="seed") as pool:
+        pending = set()
+        for submitted, plan in enumerate(plans, 1):
+            if len(pending) >= MAX_IN_FLIGHT:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(seed_thread, plan, sink))
+            if on_drained and submitted % CHECKPOINT_EVERY == 0:
+                for future in as_completed(pending):
+                    yield future.result()
+                pending = set()
+                on_drained()
+        for future in as_completed(pending):
+            yield future.result()
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CHECKPOINT
+# A small JSON file with the run configuration, the run's `now`, and how many
+# threads (and their traces/spans) are fully written to the sink. It is only
+# rewritten after sink.flush() returns, and atomically, so it never claims more
+# than the sink holds. A restart with the same configuration picks up at the
+# next thread; one with a different configuration starts over. A fresh run
+# writes an empty checkpoint before sending anything, so an interrupted run is
+# always resumed, never mistaken for a project that was already seeded.
+# ──────────────────────────────────────────────────────────────────────────────
+def backend_target():
+    # The URL and workspace OpikSink sends to, resolved the way opik.Opik() does
+    # (environment, then the config file), without creating a client
+    from opik.config import OpikConfig
+    config = OpikConfig()
+    return {"url": config.url_override, "workspace": config.workspace}
 
-        turn_scores.append(helpfulness_score())
-        chat_history.append({"role": "user",      "content": question})
-        chat_history.append({"role": "assistant",  "content": answer})
-        total_traces += 1
+def run_config():
+    # Everything that shapes the generated data or where it goes
+    return {
+        "project":       PROJECT_NAME,
+        "sink":          SINK,
+        "backend":       backend_target() if SINK != "local" else None,
+        "sink_dir":      SINK_DIR if SINK == "local" else None,
+        "master_seed":   MASTER_SEED,
+        "threads":       NUM_THREADS,
+        "target_traces": TARGET_TRACES,
+        "days_back":     DAYS_BACK,
+        "time_model":    TIME_MODEL,
+        "sampler":       SAMPLER,
+        "graph":         GRAPH_MODE,
+    }
 
-    # ── Flush then attempt thread-level frustration score ──────────────────
-    client.flush()
+def load_checkpoint():
     try:
-        client.log_threads_feedback_scores(
-            scores=[{
-                "id"    : thread_id,
-                "name"  : "user_frustration",
-                "value" : frustration_score(turn_scores),
-                "reason": f"{num_turns} turn(s), avg helpfulness {sum(turn_scores)/len(turn_scores):.2f}",
-            }]
-        )
-    except Exception:
-        pass  # Thread still active — will auto-close after 15 min inactivity
+        with open(CHECKPOINT_PATH) as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable checkpoint {CHECKPOINT_PATH}: {e}")
+        return None
+    if checkpoint.get("config") != run_config():
+        print(f"⚠️  Checkpoint {CHECKPOINT_PATH} is for a different configuration — starting over.")
+        return None
+    return checkpoint
+
+def save_checkpoint(checkpoint):
+    # Written to a temp file and renamed over the old one, so a crash mid-write
+    # leaves the previous checkpoint intact
+    directory = os.path.dirname(CHECKPOINT_PATH) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".seed_checkpoint.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CHECKPOINT_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# ──────────────────────────────────────────────────────────────────────────────
+# MAIN
+# Skip guard: a finished checkpoint for this configuration skips without any
+# network call, and an unfinished one resumes. With no checkpoint, a project
+# that already has traces counts as seeded.
+# Threads are spread over a pool of NUM_WORKERS workers that feed the shared
+# sink; with OpikSink whichever worker fills a batch sends it, so sends overlap.
+# ──────────────────────────────────────────────────────────────────────────────
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed an Opik project with synthetic OhmBot traces.")
+    parser.add_argument("command", nargs="?", choices=["seed", "replay"], default="seed",
+                        help="seed: generate traces (default); replay: upload a local sink directory")
+    parser.add_argument("directory", nargs="?", help="directory to replay")
+    parser.add_argument("--project", default=PROJECT_NAME, help="Opik project name [OPIK_PROJECT_NAME]")
+    parser.add_argument("--threads", type=int, default=NUM_THREADS, help="threads to seed [SEED_THREADS]")
+    parser.add_argument("--target-traces", type=int, default=TARGET_TRACES,
+                        help="exact trace count, overriding --threads when set [SEED_TARGET_TRACES]")
+    parser.add_argument("--days-back", type=float, default=DAYS_BACK, help="history window in days [SEED_DAYS_BACK]")
+    parser.add_argument("--time-model", choices=["beta", "diurnal"], default=TIME_MODEL, help="[SEED_TIME_MODEL]")
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS, help="[SEED_WORKERS]")
+    parser.add_argument("--seed", type=int, default=MASTER_SEED, help="master seed [SEED_MASTER_SEED]")
+    parser.add_argument("--sampler", choices=["numpy", "python"], default=SAMPLER, help="[SEED_SAMPLER]")
+    parser.add_argument("--batch-items", type=int, default=BATCH_MAX_ITEMS,
+                        help="records per bulk request [SEED_BATCH_ITEMS]")
+    parser.add_argument("--sink", choices=["opik", "local"], default=SINK, help="[SEED_SINK]")
+    parser.add_argument("--sink-dir", default=SINK_DIR, help="local sink directory [SEED_SINK_DIR]")
+    parser.add_argument("--graph", choices=["thread", "project", "trace"], default=GRAPH_MODE,
+                        help="which traces carry the agent graph; thread and project need --sink local [SEED_GRAPH]")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="[SEED_CHECKPOINT]")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY,
+                        help="threads between checkpoints [SEED_CHECKPOINT_EVERY]")
+    args = parser.parse_args(argv)
+    if args.command == "replay" and not args.directory:
+        parser.error("replay needs a directory")
+    if args.sampler == "numpy" and not HAVE_NUMPY:
+        parser.error("--sampler numpy needs numpy installed")
+    if args.graph != "trace" and args.sink != "local" and args.command != "replay":
+        parser.error(f"--graph {args.graph} needs --sink local: Opik shows the agent graph only on traces that carry it")
+    return args
+
+def main(argv=None):
+    global PROJECT_NAME, NUM_THREADS, TARGET_TRACES, DAYS_BACK, TIME_MODEL, NUM_WORKERS, MAX_IN_FLIGHT
+    global MASTER_SEED, SAMPLER, BATCH_MAX_ITEMS, SINK, SINK_DIR, GRAPH_MODE, CHECKPOINT_PATH, CHECKPOINT_EVERY
+    args = parse_args(argv)
+    PROJECT_NAME     = args.project
+    NUM_THREADS      = args.threads
+    TARGET_TRACES    = args.target_traces
+    DAYS_BACK        = args.days_back
+    TIME_MODEL       = args.time_model
+    NUM_WORKERS      = args.workers
+    MAX_IN_FLIGHT    = 4 * NUM_WORKERS
+    MASTER_SEED      = args.seed
+    SAMPLER          = args.sampler
+    BATCH_MAX_ITEMS  = args.batch_items
+    SINK             = args.sink
+    SINK_DIR         = args.sink_dir
+    GRAPH_MODE       = args.graph
+    CHECKPOINT_PATH  = args.checkpoint
+    CHECKPOINT_EVERY = args.checkpoint_every
+
+    if args.command == "replay":
+        replay(args.directory)
+        return 0
+
+    checkpoint = load_checkpoint()
+
+    if checkpoint and checkpoint["complete"]:
+        print(f"✅ Demo data already seeded ({checkpoint['done']['traces']:,} traces, per {CHECKPOINT_PATH}) — skipping seed.")
+        return 0
+
+    # The local sink never talks to a backend, so it needs no client
+    if checkpoint is None and SINK != "local":
+        try:
+            existing = get_client().search_traces(project_name=PROJECT_NAME, max_results=1)
+        except Exception as e:
+            print(f"⚠️  Could not check '{PROJECT_NAME}' for existing traces ({e!r}) — seeding anyway.")
+        else:
+            if existing:
+                print("✅ Demo data already exists — skipping seed.")
+                return 0
+
+    if checkpoint:
+        now  = datetime.fromisoformat(checkpoint["now"])
+        done = checkpoint["done"]
+        print(f"🔁 Resuming from {CHECKPOINT_PATH}: {done['threads']:,} threads / {done['traces']:,} traces already seeded.")
+    else:
+        now  = datetime.now(timezone.utc)
+        done = {"threads": 0, "traces": 0, "spans": 0}
+
+    if SINK == "local":
+        sink = LocalSink(SINK_DIR, resume=checkpoint["sink"]["files"] if checkpoint else None)
+    else:
+        sink = OpikSink(max_items=BATCH_MAX_ITEMS)
+
+    def write_checkpoint(complete=False):
+        save_checkpoint({
+            "config":   run_config(),
+            "now":      now.isoformat(),
+            "done":     dict(done),
+            "sink":     sink.close() if complete else sink.flush(),
+            "complete": complete,
+        })
+
+    if checkpoint is None:
+        write_checkpoint()
+
+    plans = thread_plans(now, start_thread=done["threads"], planned=done["traces"], sample_chunk=chunk_sampler())
+    # Everything allocated so far (modules, client, conversation data) lives for the
+    # whole run. Freezing it stops the collections that generation's allocations
+    # keep triggering from rescanning all of it each time.
+    gc.freeze()
+
+    resumed    = dict(done)
+    seed_start = time.perf_counter()
+
+    for traces, spans in tqdm(run_pipeline(plans, sink, on_drained=write_checkpoint),
+                              total=None if TARGET_TRACES else NUM_THREADS, initial=done["threads"],
+                              desc="Seeding OhmBot traces", unit="thread"):
+        done["threads"] += 1
+        done["traces"]  += traces
+        done["spans"]   += spans
+    write_checkpoint(complete=True)
+
+    elapsed = time.perf_counter() - seed_start
+    seeded  = {k: done[k] - resumed[k] for k in done}
+    print(f"✅ Seeded {done['traces']:,} traces across {done['threads']:,} threads into "
+          f"{'the local sink' if SINK == 'local' else repr(PROJECT_NAME)}.")
+    print(f"📊 {elapsed:.1f}s with {NUM_WORKERS} worker(s): "
+          f"{seeded['traces'] / elapsed:,.1f} traces/sec, {seeded['spans'] / elapsed:,.1f} spans/sec, "
+          f"{sink.summary()}")
+    return 0
 
-print(f"✅ Seeded {total_traces} traces across {NUM_THREADS} threads into '{PROJECT_NAME}'.")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,639 @@
+"""
+sql_tool.py
+Backend for the chatbot's run_sql_query tool. Queries go through a bounded,
+thread-safe pool of read-only SQLite connections (mode=ro + query_only), so
+concurrent chat sessions skip the per-call connect. Each connection keeps a
+statement cache big enough for the canonical workload, so repeated queries
+skip re-parsing. In front of the pool sits an LRU+TTL result cache keyed on
+normalized SQL plus parameters. Entries are dropped as soon as lab_setup's
+load/sync path bumps the version of a table they read, so hot catalog
+questions skip SQLite entirely.
+
+Before the SQL_Generation_Step LLM call, generate_sql() tries a template cache.
+The cache learns (question shape -> parameterized SQL) pairs, starting from
+seed_data.DATABASE_TURNS. It fills the parameters with entities from the
+question: product IDs, product names from the products table, and order IDs.
+Every statement it learns or emits must be a single read-only SELECT over the
+catalog tables.
+
+    from sql_tool import run_sql_query, generate_sql, get_pool, get_cache, get_templates
+    print(run_sql_query("SELECT price FROM products WHERE product_id = 'AUDIO-101'"))
+    run_sql_query("SELECT ...", bypass_cache=True)   # always hit the database
+    q = generate_sql("How much is the PlayStation 5?", llm=my_sql_llm)   # {"sql", "params", "source"}
+    print(run_sql_query(q["sql"], q["params"]))
+    get_pool().stats()       # pool wait time and connection counters
+    get_cache().stats()      # hits, misses, evictions, memory use
+    get_templates().stats()  # template hit rate
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from contextlib import contextmanager
+
+import lab_setup
+import seed_data
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CONFIG
+# ──────────────────────────────────────────────────────────────────────────────
+POOL_SIZE            = 8
+ACQUIRE_TIMEOUT      = 5.0   # seconds to wait for a free connection
+# Prepared statements kept per connection; room for every canonical query twice over
+STATEMENT_CACHE_SIZE = max(64, 2 * len(lab_setup.CANONICAL_QUERIES))
+CACHE_MAX_ENTRIES    = 4096
+CACHE_MAX_BYTES      = 32 * 1024 * 1024   # approximate size of the cached result rows
+CACHE_TTL            = 300.0              # seconds; backstop for edits made outside lab_setup
+# Template cache: the only tables and SQL functions a generated statement may use
+ALLOWED_TABLES       = frozenset(lab_setup.TABLE_INSERTS)   # the catalog tables, not table_versions
+ALLOWED_FUNCTIONS    = frozenset(["count", "sum", "avg", "min", "max", "total", "abs", "round", "lower", "upper",
+                                  "length", "substr", "trim", "coalesce", "ifnull", "like", "group_concat"])
+TEMPLATE_MIN_SIMILARITY = 0.5   # Jaccard similarity of shape words needed to reuse a template
+TEMPLATE_MIN_SHAPE_WORDS = 3    # shorter shapes (question's or template's) only reuse on an exact match
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CONNECTION POOL
+# ──────────────────────────────────────────────────────────────────────────────
+class ConnectionPool:
+    def __init__(self, db_path=lab_setup.DB_PATH, size=POOL_SIZE, timeout=ACQUIRE_TIMEOUT,
+                 cached_statements=STATEMENT_CACHE_SIZE):
+        self.db_path           = db_path
+        self.size              = size
+        self.timeout           = timeout
+        self.cached_statements = cached_statements
+        self._idle    = []                 # stack: the hottest statement caches get reused first
+        self._waiters = deque()            # FIFO of [entry, Event] handoff slots
+        self._lock    = threading.Lock()
+        self._created = 0
+        self._closed  = False
+        self._metrics = {"acquired": 0, "wait_total_s": 0.0, "wait_max_s": 0.0,
+                         "timeouts": 0, "opened": 0, "recycled": 0}
+
+    def _file_id(self):
+        st = os.stat(self.db_path)
+        return (st.st_dev, st.st_ino)
+
+    def _open(self):
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.execute("PRAGMA query_only = ON")
+        with self._lock:
+            self._metrics["opened"] += 1
+        # Remember which file this connection reads, to spot lab_setup republishing it
+        return conn, self._file_id()
+
+    def _healthy(self, entry):
+        conn, file_id = entry
+        try:
+            # After an atomic rebuild the path points at a new file; an old
+            # connection would keep serving the previous snapshot forever.
+            if self._file_id() != file_id:
+                return False
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except (sqlite3.Error, OSError):
+            return False
+
+    def _checkout(self):
+        # Reuse an idle connection, open a new one while under `size`, else queue
+        # up. Released connections are handed to waiters in arrival order, so
+        # under contention nobody starves behind later callers.
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            if self._created < self.size:
+                self._created += 1
+                waiter = None
+            else:
+                waiter = [None, threading.Event()]
+                self._waiters.append(waiter)
+
+        if waiter is None:
+            try:
+                return self._open()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        if not waiter[1].wait(self.timeout):
+            with self._lock:
+                if waiter[0] is None:
+                    self._waiters.remove(waiter)
+                    self._metrics["timeouts"] += 1
+                    raise TimeoutError(f"No free connection to {self.db_path} after {self.timeout}s "
+                                       f"(pool size {self.size})")
+        return waiter[0]
+
+    def _release(self, entry):
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter[0] = entry
+                waiter[1].set()
+            else:
+                self._idle.append(entry)
+
+    @contextmanager
+    def connection(self):
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        start = time.perf_counter()
+        entry = self._checkout()
+        waited = time.perf_counter() - start
+
+        if not self._healthy(entry):
+            entry[0].close()
+            with self._lock:
+                self._metrics["recycled"] += 1
+            try:
+                entry = self._open()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1  # give the slot back, e.g. if the DB is mid-rebuild
+                raise
+
+        with self._lock:
+            self._metrics["acquired"] += 1
+            self._metrics["wait_total_s"] += waited
+            self._metrics["wait_max_s"] = max(self._metrics["wait_max_s"], waited)
+        try:
+            yield entry[0]
+        finally:
+            self._release(entry)
+
+    def stats(self):
+        with self._lock:
+            m = dict(self._metrics)
+            created = self._created
+            idle = len(self._idle)
+        acquired = m["acquired"]
+        return {
+            "size":         self.size,
+            "open":         created,
+            "idle":         idle,
+            "acquired":     acquired,
+            "wait_mean_ms": m["wait_total_s"] / acquired * 1000 if acquired else 0.0,
+            "wait_max_ms":  m["wait_max_s"] * 1000,
+            "timeouts":     m["timeouts"],
+            "opened":       m["opened"],
+            "recycled":     m["recycled"],
+        }
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+_pool      = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+# ──────────────────────────────────────────────────────────────────────────────
+# RESULT CACHE
+# ──────────────────────────────────────────────────────────────────────────────
+# Tokens of a SQL string: quoted literals/identifiers, whitespace runs, everything else
+_SQL_TOKENS = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|\s+|[^'"\s]+""")
+
+_SQL_PUNCT  = set("=<>!,()*+-/%|")
+
+def normalize_sql(query):
+    # Collapses whitespace (dropping it around operators) and lower-cases everything
+    # outside quoted tokens, so trivially different spellings of the same query
+    # share one cache entry. "..." stays verbatim too: SQLite reads it as a string
+    # literal when no column has that name, so its case can change the result.
+    tokens = _SQL_TOKENS.findall(query.strip().rstrip(";").strip())
+    parts = []
+    for i, token in enumerate(tokens):
+        if token.isspace():
+            # Never let the join start a comment: "5 - -3" must not become "5--3"
+            joined = parts[-1][-1] + tokens[i + 1][0]
+            if (parts[-1][-1] not in _SQL_PUNCT and tokens[i + 1][0] not in _SQL_PUNCT) or joined in ("--", "/*"):
+                parts.append(" ")
+        elif token[0] in "'\"":
+            parts.append(token)
+        else:
+            parts.append(token.lower())
+    return "".join(parts)
+
+# An empty in-memory copy of the schema. Statements are compiled against it (as
+# EXPLAIN, never run) under an authorizer, so SQLite itself reports what they touch.
+_checker      = None
+_checker_lock = threading.Lock()
+
+def compile_sql(query, authorizer):
+    # True if `query` compiles with every action allowed by `authorizer`
+    global _checker
+    code = "".join(t for t in _SQL_TOKENS.findall(query) if t[0] != "'")
+    with _checker_lock:
+        if _checker is None:
+            _checker = sqlite3.connect(":memory:", check_same_thread=False)
+            lab_setup.create_schema(_checker)
+        _checker.set_authorizer(authorizer)
+        try:
+            _checker.execute("EXPLAIN " + query, [None] * code.count("?"))
+        except (sqlite3.Error, sqlite3.Warning):
+            return False
+        finally:
+            _checker.set_authorizer(None)
+    return True
+
+def referenced_tables(query):
+    # Every table the query reads (subqueries, comma joins and quoted names included),
+    # or None if it doesn't compile against lab_setup's schema
+    tables = set()
+    def record(action, arg1, arg2, db_name, trigger):
+        if action == sqlite3.SQLITE_READ:
+            tables.add(arg1)
+        return sqlite3.SQLITE_OK
+    return frozenset(tables) if compile_sql(query, record) else None
+
+@lru_cache(maxsize=CACHE_MAX_ENTRIES)
+def _query_shape(query):
+    # The agent re-sends the exact same strings, so tokenizing is memoized on the raw text
+    return normalize_sql(query), referenced_tables(query)
+
+def _result_size(columns, rows):
+    # Rough footprint of a result: container overhead plus each value
+    size = sys.getsizeof(rows) + sum(sys.getsizeof(c) for c in columns)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row)
+    return size
+
+class ResultCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.ttl         = ttl
+        self._entries = OrderedDict()   # key -> (expires, snapshot, columns, rows, size)
+        self._bytes   = 0
+        self._lock    = threading.Lock()
+        self._files   = {}              # db_path -> (stat signature, file id, {table: version})
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0,
+                         "invalidations": 0, "uncacheable": 0}
+
+    def _table_versions(self, pool):
+        # The table_versions rows only change when the file does, so they are
+        # re-read only when the DB's stat() signature moves (rebuild or sync).
+        st = os.stat(pool.db_path)
+        sig = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            known = self._files.get(pool.db_path)
+        if known is not None and known[0] == sig:
+            return known[1:]
+        with pool.connection() as conn:
+            try:
+                versions = dict(conn.execute("SELECT table_name, version FROM table_versions"))
+            except sqlite3.OperationalError:
+                versions = {}  # DB built before table_versions existed
+        known = (sig, (st.st_dev, st.st_ino), versions)
+        with self._lock:
+            self._files[pool.db_path] = known
+        return known[1:]
+
+    def snapshot(self, tables, pool):
+        # A rebuild publishes a new file, so its identity is part of the snapshot:
+        # entries from the old file never match, even if the counters agree
+        file_id, versions = self._table_versions(pool)
+        return (file_id,) + tuple(versions.get(t) for t in sorted(tables))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[4]
+
+    def get(self, key, snapshot):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            if entry[0] <= now:
+                self._drop(key)
+                self._metrics["expirations"] += 1
+                self._metrics["misses"] += 1
+                return None
+            if entry[1] != snapshot:
+                self._drop(key)
+                self._metrics["invalidations"] += 1
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return entry[2], entry[3]
+
+    def put(self, key, snapshot, columns, rows):
+        # `snapshot` must be taken before the query ran, so a load that lands
+        # mid-query leaves the entry already stale rather than wrongly fresh
+        size = _result_size(columns, rows)
+        if size > self.max_bytes:
+            with self._lock:
+                self._metrics["uncacheable"] += 1
+            return
+        entry = (time.monotonic() + self.ttl, snapshot, columns, rows, size)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._metrics["evictions"] += 1
+
+    def count_uncacheable(self):
+        with self._lock:
+            self._metrics["uncacheable"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            m = dict(self._metrics)
+            m["entries"] = len(self._entries)
+            m["bytes"]   = self._bytes
+        lookups = m["hits"] + m["misses"]
+        m["hit_rate"] = m["hits"] / lookups if lookups else 0.0
+        return m
+
+_cache      = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
+
+# ──────────────────────────────────────────────────────────────────────────────
+# TEMPLATE CACHE
+# A template is what is left of a (question, SQL) pair once its entities are
+# taken out. The question becomes a set of "shape" words (minus stopwords and
+# the entity's own words); the SQL has each literal equal to an entity value
+# (or %value% for LIKE) replaced by a ? parameter. A new question reuses the
+# template with the same entity kinds and the most similar shape words.
+# A template whose SQL keeps any literal after substitution (a category, a
+# number the entity extractor didn't recognise...) is exact-only: the literal
+# may belong to the question, so it is reused only for a question with exactly
+# the same shape words. So is any match between shapes of fewer than
+# TEMPLATE_MIN_SHAPE_WORDS words: with one or two words, a single shared word
+# ("have") is already half the similarity, whatever else the question asks.
+# ──────────────────────────────────────────────────────────────────────────────
+_WORDS     = re.compile(r"\w+")
+_ENTITY_ID = re.compile(r"\b[A-Za-z]+-\d+(?:-\d+)?\b")
+_SQL_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d*)?|(?<![\w.])\.\d+")
+_STOPWORDS = frozenset("""a an the is are was do does did you your i me my we our it its this that these those
+    of for in on at to from with by and or there any can could would will please what what's whats
+    which who how s""".split())
+# Anything an authorizer is asked about that isn't reading allowed tables/functions is denied
+_AUTHORIZED = {sqlite3.SQLITE_SELECT}
+
+def _authorizer(action, arg1, arg2, db_name, trigger):
+    if action in _AUTHORIZED:
+        return sqlite3.SQLITE_OK
+    if action == sqlite3.SQLITE_READ and arg1 in ALLOWED_TABLES:
+        return sqlite3.SQLITE_OK
+    if action == sqlite3.SQLITE_FUNCTION and arg2 and arg2.lower() in ALLOWED_FUNCTIONS:
+        return sqlite3.SQLITE_OK
+    return sqlite3.SQLITE_DENY
+
+@lru_cache(maxsize=CACHE_MAX_ENTRIES)
+def is_safe_sql(query):
+    # True only for one SELECT statement that reads nothing but ALLOWED_TABLES through
+    # ALLOWED_FUNCTIONS. SQLite itself compiles the statement under the authorizer
+    # (see compile_sql), so nothing hides from the check.
+    tokens = _SQL_TOKENS.findall(query.strip().rstrip(";").strip())
+    code = "".join(t for t in tokens if t[0] != "'")
+    if not tokens or tokens[0].lower() != "select" or ";" in code or "--" in code or "/*" in code:
+        return False
+    return compile_sql(query, _authorizer)
+
+def _words(text):
+    return _WORDS.findall(text.lower())
+
+class EntityIndex:
+    # Product IDs and names from the products table, reloaded when the DB file changes
+    def __init__(self, pool):
+        self.pool = pool
+        self._sig = None
+        self._ids = set()
+        self._names = {}   # first word of a name -> [(name words, name, product_id)]
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.pool.db_path)
+        except OSError:
+            return
+        sig = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if sig == self._sig:
+                return
+            ids, names = set(), {}
+            with self.pool.connection() as conn:
+                for product_id, name in conn.execute("SELECT product_id, name FROM products"):
+                    ids.add(product_id)
+                    words = tuple(_words(name))
+                    if words:
+                        names.setdefault(words[0], []).append((words, name, product_id))
+            self._ids, self._names, self._sig = ids, names, sig
+
+    def extract(self, question):
+        # ({kind: value}, set of words that belong to entities). Kinds: product_id,
+        # product_name (which also sets product_id) and order_id.
+        self._refresh()
+        words = _words(question)
+        present = set(words)
+        entities, used = {}, set()
+        for match in _ENTITY_ID.finditer(question):
+            value = match.group().upper()
+            if value in self._ids:
+                entities.setdefault("product_id", value)
+            elif "order" in present or "orders" in present:
+                entities.setdefault("order_id", value)
+            else:
+                continue
+            used.update(_words(value))
+        # Longest product name whose words all appear in the question, in any order
+        best = None
+        for word in present:
+            for name_words, name, product_id in self._names.get(word, ()):
+                if (best is None or len(name_words) > len(best[0])) and all(w in present for w in name_words):
+                    best = (name_words, name, product_id)
+        if best is not None:
+            entities["product_name"] = best[1]
+            entities.setdefault("product_id", best[2])
+            used.update(best[0])
+        return entities, used
+
+def question_shape(words, used):
+    return frozenset(w for w in words if w not in used and w not in _STOPWORDS)
+
+class TemplateCache:
+    def __init__(self, pool=None, min_similarity=TEMPLATE_MIN_SIMILARITY, min_shape_words=TEMPLATE_MIN_SHAPE_WORDS):
+        self.pool = pool or get_pool()
+        self.min_similarity = min_similarity
+        self.min_shape_words = min_shape_words
+        self.entities = EntityIndex(self.pool)
+        self._templates = {}   # (kinds, shape, sql) -> (kinds, shape, sql, [(kind, format)], exact only)
+        self._lock = threading.Lock()
+        self._metrics = {"lookups": 0, "hits": 0, "misses": 0, "learned": 0, "learned_exact": 0, "rejected": 0}
+
+    def learn(self, question, sql):
+        # Adds the template behind one (question, SQL) pair. Returns False (and stores
+        # nothing) for SQL that fails is_safe_sql().
+        if not is_safe_sql(sql):
+            with self._lock:
+                self._metrics["rejected"] += 1
+            return False
+        entities, used = self.entities.extract(question)
+        parts, params, exact = [], [], False
+        for token in _SQL_TOKENS.findall(sql.strip().rstrip(";").strip()):
+            if token[0] == "'":
+                literal = token[1:-1].replace("''", "'")
+                for kind, value in entities.items():
+                    if literal == value or literal == f"%{value}%":
+                        token = "?"
+                        params.append((kind, literal.replace(value, "{}", 1)))
+                        break
+                else:
+                    exact = True
+            elif token[0] == '"' or token.isspace():
+                pass
+            elif _SQL_NUMBER.search(token):
+                exact = True
+            parts.append(token)
+        kinds = frozenset(kind for kind, _ in params)
+        shape = question_shape(_words(question), used)
+        template = (kinds, shape, "".join(parts), params, exact)
+        with self._lock:
+            if template[:3] not in self._templates:
+                self._templates[template[:3]] = template
+                self._metrics["learned_exact" if exact else "learned"] += 1
+        return True
+
+    def match(self, question):
+        # (sql, params) from the best template, or None
+        entities, used = self.entities.extract(question)
+        shape = question_shape(_words(question), used)
+        best, best_score = None, self.min_similarity
+        with self._lock:
+            self._metrics["lookups"] += 1
+            for kinds, template_shape, sql, params, exact in self._templates.values():
+                if not kinds <= entities.keys():
+                    continue
+                if exact or min(len(shape), len(template_shape)) < self.min_shape_words:
+                    if shape != template_shape:
+                        continue
+                    score = 1.0
+                else:
+                    union = shape | template_shape
+                    score = len(shape & template_shape) / len(union) if union else 1.0
+                if score >= best_score and (best is None or score > best_score or len(kinds) > len(best[0])):
+                    best, best_score = (kinds, template_shape, sql, params), score
+            self._metrics["hits" if best else "misses"] += 1
+        if best is None:
+            return None
+        return best[2], tuple(fmt.format(entities[kind]) for kind, fmt in best[3])
+
+    def learn_corpus(self, turns=seed_data.DATABASE_TURNS):
+        for turn in turns:
+            if turn.get("sql"):
+                self.learn(turn["question"], turn["sql"])
+
+    def stats(self):
+        with self._lock:
+            m = dict(self._metrics)
+            m["templates"] = len(self._templates)
+            m["exact_templates"] = sum(t[4] for t in self._templates.values())
+        m["hit_rate"] = m["hits"] / m["lookups"] if m["lookups"] else 0.0
+        return m
+
+_templates      = None
+_templates_lock = threading.Lock()
+
+def get_templates():
+    global _templates
+    with _templates_lock:
+        if _templates is None:
+            _templates = TemplateCache()
+            _templates.learn_corpus()
+        return _templates
+
+def generate_sql(question, llm=None, templates=None):
+    # {"sql", "params", "source"}: from a template when one matches, otherwise from
+    # `llm(question)` (the SQL_Generation_Step), whose answer is learned for next time.
+    # Without an llm a miss returns sql None. LLM SQL that fails is_safe_sql() is refused.
+    templates = templates or get_templates()
+    hit = templates.match(question)
+    if hit is not None:
+        return {"sql": hit[0], "params": hit[1], "source": "template"}
+    if llm is None:
+        return {"sql": None, "params": (), "source": "miss"}
+    sql = llm(question)
+    if not templates.learn(question, sql):
+        return {"sql": None, "params": (), "source": "rejected"}
+    return {"sql": sql, "params": (), "source": "llm"}
+
+# ──────────────────────────────────────────────────────────────────────────────
+# TOOL
+# ──────────────────────────────────────────────────────────────────────────────
+def format_table(columns, rows):
+    # Markdown table, the shape the tool span output takes in the traces
+    lines = ["| " + " | ".join(columns) + " |", "|" + "|".join("------" for _ in columns) + "|"]
+    lines += ["| " + " | ".join("" if v is None else str(v) for v in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+def execute_query(query, params=(), pool=None):
+    # Returns (column names, rows)
+    with (pool or get_pool()).connection() as conn:
+        cursor = conn.execute(query, params)
+        columns = [d[0] for d in cursor.description or ()]
+        return columns, cursor.fetchall()
+
+def cached_query(query, params=(), pool=None, cache=None):
+    # execute_query() behind the result cache. Errors are never cached.
+    pool = pool or get_pool()
+    cache = cache or get_cache()
+    normalized, tables = _query_shape(query)
+    if tables is None:
+        # Unknown tables means no way to invalidate the entry, so it is never cached
+        cache.count_uncacheable()
+        return execute_query(query, params, pool)
+    key = (pool.db_path, normalized, tuple(params))
+    snapshot = cache.snapshot(tables, pool)
+    hit = cache.get(key, snapshot)
+    if hit is not None:
+        return hit
+    columns, rows = execute_query(query, params, pool)
+    cache.put(key, snapshot, columns, rows)
+    return columns, rows
+
+def run_sql_query(query, params=(), pool=None, cache=None, bypass_cache=False):
+    try:
+        if bypass_cache:
+            columns, rows = execute_query(query, params, pool)
+        else:
+            columns, rows = cached_query(query, params, pool, cache)
+    except sqlite3.Error as e:
+        # The model gets the error text back so it can correct its SQL
+        return f"SQL error: {e}"
+    if not rows:
+        return "No results."
+    return format_table(columns, rows)
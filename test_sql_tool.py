@@ -0,0 +1,56 @@
+"""
+test_sql_tool.py
+Regression tests for sql_tool's result cache and template cache, run against a
+fresh copy of lab_setup's fixture database.
+
+    python -m pytest -q test_sql_tool.py
+"""
+
+import pytest
+
+import lab_setup
+import sql_tool
+
+@pytest.fixture(scope="module")
+def pool(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("db") / "ohm_sweet_ohm.db")
+    lab_setup.create_database(db_path=db_path)
+    pool = sql_tool.ConnectionPool(db_path=db_path)
+    yield pool
+    pool.close()
+
+# ──────────────────────────────────────────────────────────────────────────────
+# RESULT CACHE
+# ──────────────────────────────────────────────────────────────────────────────
+def test_double_quoted_strings_keep_their_case_in_the_cache_key(pool):
+    # With no column of that name, SQLite reads "Audio" as a string literal
+    cache = sql_tool.ResultCache()
+    upper = 'SELECT product_id FROM products WHERE category = "Audio"'
+    lower = 'SELECT product_id FROM products WHERE category = "audio"'
+    assert sql_tool.normalize_sql(upper) != sql_tool.normalize_sql(lower)
+
+    _, rows = sql_tool.cached_query(upper, pool=pool, cache=cache)
+    assert rows
+    assert sql_tool.cached_query(lower, pool=pool, cache=cache) == sql_tool.execute_query(lower, pool=pool)
+
+def test_normalize_sql_folds_only_unquoted_text():
+    assert sql_tool.normalize_sql("SELECT  Price FROM products WHERE product_id = 'AUDIO-101' ;") == \
+        "select price from products where product_id='AUDIO-101'"
+
+# ──────────────────────────────────────────────────────────────────────────────
+# TEMPLATE CACHE
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def templates(pool):
+    templates = sql_tool.TemplateCache(pool)
+    templates.learn_corpus()
+    return templates
+
+def test_short_shape_template_needs_an_exact_match(templates):
+    # "Do you have GAME-1101?" leaves the one-word shape {"have"}
+    assert templates.match("Do you have AUDIO-101 in white?") is None
+    assert templates.match("Do you have AUDIO-101?") == ("SELECT in_stock FROM products WHERE product_id = ?", ("AUDIO-101",))
+
+def test_long_shape_template_matches_similar_questions(templates):
+    sql, params = templates.match("How many AirStream Wireless Earbuds do you have in stock right now?")
+    assert "stock_level" in sql and params == ("%AirStream Wireless Earbuds%",)